@@ -0,0 +1,81 @@
+"""
+Forms of the admin panel. The admin views import this module on first use,
+so WTForms and Flask-WTF are not loaded when a worker starts.
+"""
+from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileAllowed
+from wtforms import StringField, TextAreaField, SubmitField, DateField, IntegerField, PasswordField
+from wtforms.validators import DataRequired, Email, EqualTo, Length, ValidationError
+from tags import set_project_tags
+from images import image_processor, ALLOWED_EXTENSIONS
+
+
+# --- Form Fields ---
+
+class TagListField(StringField):
+    """Comma-separated text in the form, Tag rows on the model."""
+
+    def process_data(self, value):
+        if value is not None and not isinstance(value, str):
+            value = ', '.join(tag.name for tag in value)
+        self.data = value
+
+    def populate_obj(self, obj, name):
+        set_project_tags(obj, self.data)
+
+
+class ImageUploadField(FileField):
+    """Optional upload; a new file replaces the Image of the project, no file keeps it."""
+
+    def process_data(self, value):
+        # The current Image is shown by the template, only a fresh upload is form data
+        self.data = None
+
+    def pre_validate(self, form):
+        # Checks the content itself, the filename extension proves nothing
+        if self.data:
+            try:
+                image_processor.check_upload(self.data)
+            except ValueError as e:
+                raise ValidationError(str(e)) from e
+
+    def populate_obj(self, obj, name):
+        if self.data:
+            setattr(obj, name, image_processor.store_upload(self.data))
+
+
+# --- Form Classes ---
+
+class LoginForm(FlaskForm):
+    """Admin Login Form"""
+    username = StringField('Username', validators=[DataRequired()])
+    password = PasswordField('Password', validators=[DataRequired()])
+    submit = SubmitField('Login')
+
+class ProjectForm(FlaskForm):
+    title = StringField('Title', validators=[DataRequired()])
+    description = TextAreaField('Description', validators=[DataRequired()])
+    github_link = StringField('GitHub Link')
+    live_link = StringField('Live Link')
+    image_url = StringField('Image URL')
+    image = ImageUploadField('Upload Image', validators=[FileAllowed(ALLOWED_EXTENSIONS, 'Images only!')])
+    tags = TagListField('Tags (comma-separated)')
+    submit = SubmitField('Save Project')
+
+class SkillForm(FlaskForm):
+    name = StringField('Skill Name', validators=[DataRequired()])
+    level = IntegerField('Proficiency Level (1-100)', validators=[DataRequired()])
+    category = StringField('Category', validators=[DataRequired()])
+    submit = SubmitField('Save Skill')
+
+class CertificationForm(FlaskForm):
+    name = StringField('Certification Name', validators=[DataRequired()])
+    issuer = StringField('Issuing Organization', validators=[DataRequired()])
+    date_issued = DateField('Date Issued (YYYY-MM-DD)', validators=[DataRequired()], format='%Y-%m-%d')
+    credential_link = StringField('Credential Link')
+    submit = SubmitField('Save Certification')
+
+class BlogPostForm(FlaskForm):
+    title = StringField('Title', validators=[DataRequired()])
+    content = TextAreaField('Content', validators=[DataRequired()])
+    submit = SubmitField('Save Post')
@@ -0,0 +1,228 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import Visit, VisitRollup, UserAgentRollup, RollupState
+
+STATE_NAME = 'visits'
+
+# Raw rows are kept at least this long so unique-IP counts for the current
+# day can still be recomputed when late visits arrive
+MIN_RETENTION_DAYS = 2
+
+
+def _hour_start(ts):
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def _day_start(ts):
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _period_end(period, start):
+    return start + (timedelta(hours=1) if period == 'hour' else timedelta(days=1))
+
+
+# --- Rollups ---
+
+def rollup_visits(batch_size=None):
+    """
+    Folds visits above the high-water mark into the hourly/daily rollups.
+    Each batch and its new high-water mark are committed together, and the
+    mark is advanced with a compare-and-set so that concurrent runs in
+    several workers never count a visit twice. Unique IPs are counted once
+    per touched period after the last batch. Returns the rows processed.
+    """
+    batch_size = batch_size or current_app.config.get('VISIT_ROLLUP_BATCH', 10000)
+    processed = 0
+    touched = set()
+    up_to_id = 0
+    while True:
+        state = db.session.get(RollupState, STATE_NAME)
+        last_id = state.last_id if state else 0
+        rows = (db.session.query(Visit.id, Visit.timestamp, Visit.ip_address, Visit.user_agent)
+                .filter(Visit.id > last_id)
+                .order_by(Visit.id)
+                .limit(batch_size)
+                .all())
+        if not rows:
+            break
+        new_last_id = rows[-1].id
+
+        hits = Counter()
+        agents = Counter()
+        for row in rows:
+            ts = row.timestamp or datetime.utcnow()
+            hits[('hour', _hour_start(ts))] += 1
+            hits[('day', _day_start(ts))] += 1
+            agents[(ts.date(), (row.user_agent or '')[:255])] += 1
+
+        if not _advance_mark(state, last_id, new_last_id):
+            # Another worker processed this range first
+            db.session.rollback()
+            continue
+        _merge_periods(hits)
+        _merge_agents(agents)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            continue
+
+        touched.update(hits)
+        up_to_id = new_last_id
+        processed += len(rows)
+        if len(rows) < batch_size:
+            break
+
+    if touched:
+        _count_unique_ips(touched, up_to_id)
+        db.session.commit()
+    return processed
+
+
+def _advance_mark(state, last_id, new_last_id):
+    now = datetime.utcnow()
+    if state is None:
+        db.session.add(RollupState(name=STATE_NAME, last_id=new_last_id, updated_at=now))
+        return True
+    updated = db.session.execute(
+        db.update(RollupState)
+        .where(RollupState.name == STATE_NAME, RollupState.last_id == last_id)
+        .values(last_id=new_last_id, updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return updated == 1
+
+
+def _merge_periods(hits):
+    existing = _rollups(hits)
+    for (period, start), count in hits.items():
+        rollup = existing.get((period, start))
+        if rollup is None:
+            db.session.add(VisitRollup(period=period, period_start=start, hits=count, unique_ips=0))
+        else:
+            rollup.hits += count
+
+
+def _count_unique_ips(periods, up_to_id):
+    # One COUNT(DISTINCT) per period for the whole run, not one per batch
+    for (period, start), rollup in _rollups(periods).items():
+        unique_ips = (db.session.query(func.count(func.distinct(Visit.ip_address)))
+                      .filter(Visit.timestamp >= start,
+                              Visit.timestamp < _period_end(period, start),
+                              Visit.id <= up_to_id)
+                      .scalar())
+        # Raw rows for old periods may already be pruned, never lower the count
+        rollup.unique_ips = max(rollup.unique_ips, unique_ips)
+
+
+def _rollups(periods):
+    """Existing VisitRollup rows for the given (period, period_start) keys."""
+    starts = [start for _, start in periods]
+    rows = VisitRollup.query.filter(VisitRollup.period_start.between(min(starts), max(starts)))
+    return {(r.period, r.period_start): r for r in rows if (r.period, r.period_start) in periods}
+
+
+def _merge_agents(agents):
+    days = [day for day, _ in agents]
+    existing = {
+        (r.day, r.user_agent): r
+        for r in UserAgentRollup.query.filter(UserAgentRollup.day.between(min(days), max(days)))
+    }
+    for (day, user_agent), count in agents.items():
+        rollup = existing.get((day, user_agent))
+        if rollup is None:
+            db.session.add(UserAgentRollup(day=day, user_agent=user_agent, hits=count))
+        else:
+            rollup.hits += count
+
+
+# --- Retention ---
+
+def prune_visits(retention_days=None, batch_size=None):
+    """
+    Deletes raw visits older than the retention window in batches. Only rows
+    already folded into the rollups are removed. Returns the rows deleted.
+    """
+    config = current_app.config
+    retention_days = retention_days or config.get('VISIT_RETENTION_DAYS', 90)
+    batch_size = batch_size or config.get('VISIT_ROLLUP_BATCH', 10000)
+    cutoff = datetime.utcnow() - timedelta(days=max(retention_days, MIN_RETENTION_DAYS))
+
+    state = db.session.get(RollupState, STATE_NAME)
+    if state is None:
+        return 0
+    last_id = state.last_id
+
+    deleted = 0
+    while True:
+        count = db.session.execute(
+            db.delete(Visit)
+            .where(Visit.id.in_(prune_batch(cutoff, last_id, batch_size).scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def prune_batch(cutoff, last_id, batch_size):
+    """
+    Ids of the next batch prune_visits() deletes. It walks ix_visit_timestamp
+    from the oldest row, so it stops at the cutoff instead of scanning every
+    retained row below the high-water mark; id <= last_id is only a filter.
+    """
+    return (db.select(Visit.id)
+            .where(Visit.timestamp < cutoff, Visit.id <= last_id)
+            .order_by(Visit.timestamp)
+            .limit(batch_size))
+
+
+# --- Dashboard ---
+
+def dashboard_stats(days=7, top_agents=5):
+    """Visit figures for the admin dashboard, read from the rollup tables only."""
+    now = datetime.utcnow()
+    since = _day_start(now) - timedelta(days=days - 1)
+
+    daily = {
+        r.period_start: r
+        for r in VisitRollup.query
+        .filter(VisitRollup.period == 'day', VisitRollup.period_start >= since)
+    }
+    last_24h = (db.session.query(func.coalesce(func.sum(VisitRollup.hits), 0))
+                .filter(VisitRollup.period == 'hour',
+                        VisitRollup.period_start > _hour_start(now) - timedelta(hours=24))
+                .scalar())
+    total = (db.session.query(func.coalesce(func.sum(VisitRollup.hits), 0))
+             .filter(VisitRollup.period == 'day')
+             .scalar())
+    agents = (db.session.query(UserAgentRollup.user_agent, func.sum(UserAgentRollup.hits).label('hits'))
+              .filter(UserAgentRollup.day >= since.date())
+              .group_by(UserAgentRollup.user_agent)
+              .order_by(func.sum(UserAgentRollup.hits).desc())
+              .limit(top_agents)
+              .all())
+
+    days_list = []
+    for offset in range(days):
+        day = since + timedelta(days=offset)
+        rollup = daily.get(day)
+        days_list.append({
+            'day': day.date(),
+            'hits': rollup.hits if rollup else 0,
+            'unique_ips': rollup.unique_ips if rollup else 0,
+        })
+
+    return {
+        'total': total,
+        'last_24h': last_24h,
+        'days': days_list,
+        'top_agents': agents,
+    }
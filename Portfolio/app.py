@@ -1,13 +1,22 @@
 import os
 from flask import Flask
-from dotenv import load_dotenv
 from config import DevelopmentConfig, ProductionConfig
-from extensions import db, login_manager, migrate
+from extensions import db, login_manager, init_migrate
+from database import init_engines
+from visits import visit_recorder
+from cache import page_cache
+from outbox import mail_outbox
+from search import search_index
+from metrics import request_metrics
+from assets import asset_pipeline
+from user_cache import user_cache
+from images import image_processor
+from snapshot import content_snapshot
+from static_site import static_site
+from schema import prepare_schema
+from cli import portfolio_cli
 from datetime import datetime  # <-- IMPORT THE DATETIME MODULE
 
-# Load environment variables from .env file
-load_dotenv()
-
 def create_app():
     """
     Factory function to create and configure the Flask application.
@@ -20,8 +29,21 @@ def create_app():
 
     # Initialize extensions with the application instance
     db.init_app(app)
+    init_engines(app)
     login_manager.init_app(app)
-    migrate.init_app(app, db)
+    # Flask-Migrate is only needed for `flask db`; skipping it spares web workers the Alembic import
+    if app.config['SCHEMA_MANAGEMENT'] != 'check' or os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        init_migrate(app)
+    visit_recorder.init_app(app)
+    page_cache.init_app(app)
+    mail_outbox.init_app(app)
+    search_index.init_app(app)
+    request_metrics.init_app(app)
+    asset_pipeline.init_app(app)
+    image_processor.init_app(app)
+    user_cache.init_app(app)
+    content_snapshot.init_app(app)
+    static_site.init_app(app)
 
     # Configure Flask-Login settings
     login_manager.login_view = 'admin.login'
@@ -31,10 +53,10 @@ def create_app():
     # Import models to ensure they are registered with SQLAlchemy
     from models import User
 
-    # User loader function for Flask-Login
+    # User loader function for Flask-Login; identities are cached for USER_CACHE_TTL seconds
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return user_cache.load(user_id)
         
     # NEW: Context processor to inject variables into all templates
     @app.context_processor
@@ -45,12 +67,16 @@ def create_app():
     # Register Blueprints for different parts of the app
     from routes.portfolio import portfolio_bp
     from routes.admin import admin_bp
+    from routes.api import api_bp
     app.register_blueprint(portfolio_bp)
     app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(api_bp, url_prefix='/api/v1')
+
+    # Register the `flask portfolio ...` maintenance commands
+    app.cli.add_command(portfolio_cli)
 
-    with app.app_context():
-        # Create database tables for our models if they don't exist
-        db.create_all()
+    # create_all() in development, only a revision check in production (see SCHEMA_MANAGEMENT)
+    prepare_schema(app)
 
     return app
 
@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+
+from flask import request, send_from_directory, url_for, abort
+
+from runtime import write_atomic
+
+try:
+    import brotli
+except ImportError:  # Optional; without it only gzip variants are built
+    brotli = None
+
+MANIFEST = 'manifest.json'
+# Bundles built by `flask portfolio build-assets`: logical name -> Tailwind input file
+BUNDLES = {'main.css': 'frontend/main.css'}
+TAILWIND_CONFIG = 'frontend/tailwind.config.js'
+# Hashed filenames never change content, so browsers may keep them for a year
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class AssetPipeline:
+    """
+    Serves the compiled, fingerprinted CSS from static/dist.
+
+    `flask portfolio build-assets` compiles the bundles, names each file after
+    a hash of its content and writes gzip/brotli variants next to it plus a
+    manifest. Templates link them with `asset_url('static', filename=...)`,
+    which takes the same arguments as url_for and falls back to it for files
+    that are not in the manifest.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.manifest = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.output_dir = os.path.join(app.static_folder, 'dist')
+        self.manifest = self._load_manifest()
+        app.add_url_rule(f'{app.static_url_path}/dist/<path:filename>', 'asset', self.serve)
+        app.add_template_global(self.asset_url, 'asset_url')
+        app.add_template_global(self.manifest, 'asset_manifest')
+        app.extensions['assets'] = self
+        if app.debug and self.manifest and self._templates_changed():
+            app.logger.warning('Templates changed since the last asset build; run `flask portfolio build-assets`.')
+
+    def asset_url(self, endpoint, **values):
+        """url_for() that resolves static files to their fingerprinted build output."""
+        filename = values.get('filename')
+        if endpoint == 'static' and filename in self.manifest:
+            values['filename'] = self.manifest[filename]
+            return url_for('asset', **values)
+        return url_for(endpoint, **values)
+
+    def serve(self, filename):
+        """Sends a built file, precompressed when the client accepts it."""
+        if filename not in self.manifest.values():
+            abort(404)
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.exists(os.path.join(self.output_dir, filename + suffix)):
+                response = send_from_directory(self.output_dir, filename + suffix,
+                                               mimetype=mimetypes.guess_type(filename)[0])
+                response.content_encoding = encoding
+                break
+        else:
+            response = send_from_directory(self.output_dir, filename)
+        response.headers['Cache-Control'] = IMMUTABLE
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def build(self, tailwind=None, log=print):
+        """Compiles every bundle, writes hashed and precompressed files and the manifest."""
+        root = self.app.root_path
+        tailwind = tailwind or self.app.config.get('TAILWIND_CLI', 'tailwindcss')
+        os.makedirs(self.output_dir, exist_ok=True)
+        previous = self._load_manifest()
+
+        manifest = {}
+        for name, source in BUNDLES.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                compiled = os.path.join(tmp, name)
+                # Relative content globs in the Tailwind config resolve against the app root
+                subprocess.run([tailwind, '-c', TAILWIND_CONFIG, '-i', source, '-o', compiled, '--minify'],
+                               cwd=root, check=True)
+                with open(compiled, 'rb') as f:
+                    content = f.read()
+            stem, ext = os.path.splitext(name)
+            hashed = f'{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}'
+            self._write_variants(hashed, content)
+            manifest[name] = hashed
+            log(f'{name} -> {hashed} ({len(content)} bytes)')
+
+        self._write_atomic(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True).encode())
+        self._prune(set(manifest.values()) | set(previous.values()))
+        self.manifest.clear()
+        self.manifest.update(manifest)
+        return manifest
+
+    # --- Internal helpers ---
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_variants(self, filename, content):
+        self._write_atomic(filename, content)
+        # mtime=0 keeps the gzip output byte-identical across builds
+        self._write_atomic(filename + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+        if brotli is not None:
+            self._write_atomic(filename + '.br', brotli.compress(content, quality=11))
+
+    def _write_atomic(self, filename, data):
+        write_atomic(os.path.join(self.output_dir, filename), data)
+
+    def _prune(self, keep):
+        # Files of the previous build stay for pages that are still cached with the old names
+        for entry in os.listdir(self.output_dir):
+            base = entry[:-3] if entry.endswith(('.gz', '.br')) else entry
+            if entry != MANIFEST and base not in keep:
+                path = os.path.join(self.output_dir, entry)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+
+    def _templates_changed(self):
+        built = os.path.getmtime(os.path.join(self.output_dir, MANIFEST))
+        template_root = os.path.join(self.app.root_path, self.app.template_folder)
+        for root, _, files in os.walk(template_root):
+            for filename in files:
+                if os.path.getmtime(os.path.join(root, filename)) > built:
+                    return True
+        return False
+
+
+asset_pipeline = AssetPipeline()
@@ -0,0 +1,24 @@
+"""
+Benchmark suite for the portfolio app.
+
+    python -m benchmarks.seed     fill a database with synthetic data
+    python -m benchmarks.run      measure latency/throughput of the main pages
+    python -m benchmarks.compare  diff two result files and flag regressions
+
+Run the modules from the Portfolio directory so that app.py is importable.
+"""
+import os
+import tempfile
+
+
+def configure_environment(database=None):
+    """
+    Points config.py at `database` (a throwaway file by default) and turns off
+    background work that would otherwise skew measurements. Must run before
+    app/config are imported. Returns the database path.
+    """
+    database = os.path.abspath(database or os.path.join(tempfile.mkdtemp(), 'benchmark.db'))
+    os.environ['FLASK_ENV'] = 'development'
+    os.environ['DEV_DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ.setdefault('MAIL_OUTBOX_WORKER', 'false')
+    return database
@@ -0,0 +1,78 @@
+"""
+Compares two benchmark result files and flags regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 0.10] [--min-delta-ms 0.5]
+
+Exits with status 1 if any scenario got slower (or lost throughput) by more
+than the threshold, or started returning errors.
+"""
+import argparse
+import json
+import sys
+
+# (metric, True if a higher value is worse)
+METRICS = [
+    ('p50_ms', True),
+    ('p95_ms', True),
+    ('p99_ms', True),
+    ('throughput_rps', False),
+]
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, candidate, threshold=0.10, min_delta_ms=0.5):
+    """Returns (rows, regressions); each row is (scenario, metric, old, new, change, regressed)."""
+    rows, regressions = [], []
+    for name, new in candidate['scenarios'].items():
+        old = baseline['scenarios'].get(name)
+        if old is None:
+            continue
+        for metric, higher_is_worse in METRICS:
+            before, after = old[metric], new[metric]
+            change = (after - before) / before if before else 0.0
+            worse = change > threshold if higher_is_worse else change < -threshold
+            # Sub-millisecond wobble on fast pages is noise, not a regression
+            if metric.endswith('_ms') and abs(after - before) < min_delta_ms:
+                worse = False
+            rows.append((name, metric, before, after, change, worse))
+            if worse:
+                regressions.append((name, metric))
+        if new['errors'] > old['errors']:
+            rows.append((name, 'errors', old['errors'], new['errors'], 0.0, True))
+            regressions.append((name, 'errors'))
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative change that counts as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5, help='ignore latency changes smaller than this')
+    args = parser.parse_args(argv)
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    for key in ('driver', 'concurrency', 'sizes'):
+        if baseline['environment'].get(key) != candidate['environment'].get(key):
+            print(f"warning: runs differ in {key}: {baseline['environment'].get(key)} "
+                  f"vs {candidate['environment'].get(key)}", file=sys.stderr)
+
+    rows, regressions = compare(baseline, candidate, args.threshold, args.min_delta_ms)
+    for name, metric, before, after, change, worse in rows:
+        flag = 'REGRESSION' if worse else ''
+        print(f'{name:<22} {metric:<15} {before:10.2f} -> {after:10.2f}  {change:+7.1%}  {flag}')
+
+    if regressions:
+        print(f'{len(regressions)} regression(s) above {args.threshold:.0%}.')
+        return 1
+    print('No regressions.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Multi-process concurrency test for the database layer.
+
+Starts several worker processes, like gunicorn workers, that share one
+SQLite file and run a mix of page views (each committing a visit), contact
+form posts and admin page reads for a fixed time. Reports throughput,
+latency and errors, and exits non-zero if any request failed with
+"database is locked".
+
+Usage:
+    python -m benchmarks.concurrency [--processes 8] [--duration 10] [--write-ratio 0.3]
+                                     [--pragmas on|off] [--output results.json]
+
+--pragmas off runs the same load with rollback journaling and no tuning,
+which is how the app behaved before the SQLite pragmas were added.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+from benchmarks import configure_environment
+from benchmarks.seed import BENCH_USERNAME, BENCH_PASSWORD, seed
+
+# Settings of the app before the connection pragmas existed
+UNTUNED = {'SQLITE_JOURNAL_MODE': 'delete', 'SQLITE_SYNCHRONOUS': 'full', 'SQLITE_MMAP_SIZE': '0',
+           'SQLITE_BUSY_TIMEOUT': '5000'}
+
+READS = [('/', None, False), ('/blog', None, False), ('/projects', None, False),
+         ('/admin/dashboard', None, True), ('/admin/messages', None, True)]
+WRITE = ('/contact', {'name': 'Load', 'email': 'load@example.com', 'message': 'Concurrency test'}, False)
+
+
+def worker(index, duration, write_ratio, results):
+    from sqlalchemy.exc import OperationalError
+    from app import create_app
+
+    app = create_app()
+    app.config.update(WTF_CSRF_ENABLED=False, TESTING=True)
+    public, admin = app.test_client(), app.test_client()
+    admin.post('/admin/login', data={'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+    rng = random.Random(index)
+
+    latencies, errors, locked = [], 0, 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        path, data, login = WRITE if rng.random() < write_ratio else rng.choice(READS)
+        client = admin if login else public
+        started = time.perf_counter()
+        try:
+            response = client.post(path, data=data) if data else client.get(path)
+            if response.status_code >= 500:
+                errors += 1
+        except OperationalError as e:
+            errors += 1
+            locked += 'locked' in str(e)
+        latencies.append((time.perf_counter() - started) * 1000)
+    results.put({'requests': len(latencies), 'errors': errors, 'locked': locked, 'latencies': latencies})
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds of load per process')
+    parser.add_argument('--write-ratio', type=float, default=0.3, help='share of requests that post the contact form')
+    parser.add_argument('--pragmas', choices=['on', 'off'], default='on')
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    configure_environment()
+    # Every page view commits a visit, and pages are rendered rather than served from the cache
+    os.environ.update(VISIT_TRACKING_MODE='sync', PAGE_CACHE_BACKEND='none', METRICS_ENABLED='false')
+    if args.pragmas == 'off':
+        os.environ.update(UNTUNED)
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        seed({'projects': 100, 'tags': 20, 'skills': 20, 'certifications': 20, 'blog_posts': 100,
+              'messages': 1000, 'visits': 10000}, log=lambda line: None)
+
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(i, args.duration, args.write_ratio, results))
+                 for i in range(args.processes)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    latencies = [ms for sample in samples for ms in sample['latencies']]
+    summary = {
+        'processes': args.processes,
+        'duration_s': args.duration,
+        'write_ratio': args.write_ratio,
+        'pragmas': args.pragmas,
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / args.duration, 1),
+        'errors': sum(sample['errors'] for sample in samples),
+        'lock_errors': sum(sample['locked'] for sample in samples),
+        'p50_ms': round(percentile(latencies, 0.50), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'p99_ms': round(percentile(latencies, 0.99), 2),
+    }
+    print(f"{summary['requests']} requests ({summary['throughput_rps']} req/s), {summary['errors']} errors, "
+          f"{summary['lock_errors']} 'database is locked', p50={summary['p50_ms']}ms p95={summary['p95_ms']}ms "
+          f"p99={summary['p99_ms']}ms", file=sys.stderr)
+
+    output = json.dumps(summary, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 1 if summary['lock_errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Query-plan check for the hot queries used by the routes.
+
+Seeds a throwaway SQLite database with a large dataset, runs EXPLAIN QUERY
+PLAN for every query listed in HOT_QUERIES and fails if any of them scans a
+whole table or sorts with a temporary B-tree instead of walking an index.
+
+Usage:
+    python -m benchmarks.query_plans [--rows 50000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from benchmarks import configure_environment
+
+
+def hot_queries():
+    """Returns (label, query, allow_temp_sort) for each hot query in routes/ and the helpers they call."""
+    from sqlalchemy import func, tuple_
+    from analytics import prune_batch
+    from extensions import db
+    from models import (Project, Certification, BlogPost, Message, Visit, User,
+                        VisitRollup, UserAgentRollup, OutboxMessage, Tag, project_tag)
+
+    now = datetime.utcnow()
+    return [
+        ('portfolio.index projects', Project.query.order_by(Project.date_created.desc()), False),
+        ('portfolio.index certifications', Certification.query.order_by(Certification.date_issued.desc()), False),
+        ('portfolio.index blog posts', BlogPost.query.order_by(BlogPost.date_posted.desc()).limit(3), False),
+        ('portfolio.projects tag filter',
+         Project.query.join(project_tag).filter(project_tag.c.tag_id == 1)
+         .order_by(Project.date_created.desc()), True),
+        ('portfolio.projects tag lookup', Tag.query.filter_by(slug='flask'), False),
+        ('portfolio.blog next page',
+         BlogPost.query.filter(tuple_(BlogPost.date_posted, BlogPost.id) < tuple_(now, 10 ** 9))
+         .order_by(BlogPost.date_posted.desc(), BlogPost.id.desc()).limit(11), False),
+        ('portfolio.blog_post slug lookup', BlogPost.query.filter_by(slug='post-1'), False),
+        ('blog unique slug',
+         db.session.query(BlogPost.slug)
+         .filter(db.or_(BlogPost.slug == 'post', BlogPost.slug.between('post-', 'post.'))), False),
+        ('admin.login user', User.query.filter_by(username='admin'), False),
+        ('admin.dashboard unread count',
+         db.session.query(func.count(Message.id)).filter(Message.is_read == False), False),  # noqa: E712
+        ('admin.dashboard daily rollups',
+         VisitRollup.query.filter(VisitRollup.period == 'day', VisitRollup.period_start >= now - timedelta(days=7)), False),
+        ('admin.dashboard top agents',
+         db.session.query(UserAgentRollup.user_agent, func.sum(UserAgentRollup.hits))
+         .filter(UserAgentRollup.day >= (now - timedelta(days=7)).date())
+         .group_by(UserAgentRollup.user_agent)
+         .order_by(func.sum(UserAgentRollup.hits).desc()), True),
+        ('admin.list_projects', Project.query.order_by(Project.date_created.desc()), False),
+        ('admin.list_certifications', Certification.query.order_by(Certification.date_issued.desc()), False),
+        ('admin.list_blog_posts', BlogPost.query.order_by(BlogPost.date_posted.desc()), False),
+        ('admin.view_messages', Message.query.order_by(Message.timestamp.desc()), False),
+        ('admin.view_messages next page',
+         Message.query.filter(tuple_(Message.timestamp, Message.id) < tuple_(now, 10 ** 9))
+         .order_by(Message.timestamp.desc(), Message.id.desc()).limit(26), False),
+        ('admin.view_messages unread page',
+         Message.query.filter(Message.is_read == False,  # noqa: E712
+                              tuple_(Message.timestamp, Message.id) < tuple_(now, 10 ** 9))
+         .order_by(Message.timestamp.desc(), Message.id.desc()).limit(26), False),
+        ('admin.list_projects next page',
+         Project.query.filter(tuple_(Project.date_created, Project.id) < tuple_(now, 10 ** 9))
+         .order_by(Project.date_created.desc(), Project.id.desc()).limit(26), False),
+        ('inbox mark read before date',
+         db.session.query(Message.id).filter(Message.timestamp < now, Message.is_read == False), False),  # noqa: E712
+        ('inbox delete read older than',
+         db.session.query(Message.id).filter(Message.timestamp < now - timedelta(days=90),
+                                             Message.is_read == True), False),  # noqa: E712
+        ('inbox delete cascade',
+         db.session.query(OutboxMessage.id).filter(OutboxMessage.message_id == 1), False),
+        ('analytics unique ips',
+         db.session.query(func.count(func.distinct(Visit.ip_address)))
+         .filter(Visit.timestamp >= now - timedelta(hours=1), Visit.timestamp < now), True),
+        ('analytics prune', prune_batch(now - timedelta(days=90), 10 ** 9, 10000), False),
+        ('outbox claim',
+         db.session.query(OutboxMessage.id)
+         .filter(OutboxMessage.status == 'pending', OutboxMessage.next_attempt_at <= now)
+         .order_by(OutboxMessage.id), True),
+    ]
+
+
+def seed(rows):
+    """Bulk-inserts `rows` rows into each table the hot queries touch."""
+    from extensions import db
+    from models import Project, Certification, BlogPost, Message, Visit, User, Tag, project_tag
+
+    now = datetime.utcnow()
+
+    def when(i):
+        return now - timedelta(minutes=random.randint(0, 60 * 24 * 365))
+
+    db.session.execute(db.insert(User), [{'username': f'user{i}', 'password_hash': 'x'} for i in range(100)])
+    db.session.execute(db.insert(Project), [
+        {'title': f'Project {i}', 'description': 'Lorem ipsum', 'date_created': when(i)} for i in range(rows)])
+    db.session.execute(db.insert(Certification), [
+        {'name': f'Cert {i}', 'issuer': 'Issuer', 'date_issued': when(i).date()} for i in range(rows)])
+    db.session.execute(db.insert(BlogPost), [
+        {'title': f'Post {i}', 'content': 'Lorem ipsum', 'author': 'Admin', 'slug': f'post-{i}',
+         'date_posted': when(i)} for i in range(rows)])
+    db.session.execute(db.insert(Message), [
+        {'name': f'Sender {i}', 'email': 'a@example.com', 'message': 'Hello', 'timestamp': when(i),
+         'is_read': random.random() < 0.9} for i in range(rows)])
+    db.session.execute(db.insert(Visit), [
+        {'ip_address': f'10.0.{i % 256}.{i % 200}', 'user_agent': 'bench', 'timestamp': when(i)}
+        for i in range(rows)])
+    db.session.execute(db.insert(Tag), [
+        {'name': f'Tag {i}', 'slug': f'tag-{i}', 'project_count': 0} for i in range(200)])
+    db.session.execute(db.insert(project_tag), [
+        {'project_id': i + 1, 'tag_id': i % 200 + 1} for i in range(rows)])
+    db.session.commit()
+    db.session.execute(db.text('ANALYZE'))
+
+
+def explain(query):
+    """Returns the EXPLAIN QUERY PLAN detail lines for a Query or select()."""
+    from extensions import db
+
+    statement = getattr(query, 'statement', query)
+    compiled = statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    with db.engine.connect() as conn:
+        return [row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}')]
+
+
+def problems(plan, allow_temp_sort=False):
+    """Lists the plan lines that show a full table scan, a rowid walk from the first row or an unindexed sort."""
+    found = []
+    for line in plan:
+        if line.startswith('SCAN') and 'USING' not in line:
+            found.append(line)
+        elif '(rowid<' in line:
+            # Upper-bounded only, so it reads every row below the bound
+            found.append(line)
+        elif 'USE TEMP B-TREE' in line and not allow_temp_sort:
+            found.append(line)
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000, help='rows to seed per table')
+    args = parser.parse_args(argv)
+
+    configure_environment(os.path.join(tempfile.mkdtemp(), 'query_plans.db'))
+    os.environ['VISIT_TRACKING_MODE'] = 'sync'
+
+    from app import create_app
+    app = create_app()
+    failures = 0
+    with app.app_context():
+        seed(args.rows)
+        for label, query, allow_temp_sort in hot_queries():
+            plan = explain(query)
+            bad = problems(plan, allow_temp_sort)
+            status = 'FAIL' if bad else 'ok'
+            print(f'{status:4}  {label}: {" | ".join(plan)}')
+            failures += bool(bad)
+
+    print(f'{failures} query plan(s) without an index.' if failures else 'All hot queries use an index.')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""
+Latency and throughput benchmark for the main pages.
+
+Drives each scenario either in-process through the Flask test client or over
+HTTP against a local threaded WSGI server, and writes the results as JSON.
+
+Usage:
+    python -m benchmarks.run [--db bench.db | --scale 0.1] [--driver test-client|wsgi]
+                             [--requests 500] [--concurrency 4] [--output results.json]
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from benchmarks import configure_environment
+from benchmarks.seed import BENCH_USERNAME, BENCH_PASSWORD, add_size_arguments, seed, sizes_from_args
+
+RESULT_FORMAT = 1
+
+
+class Scenario:
+    """One request to measure: method, path, form data and whether it needs a login."""
+
+    def __init__(self, name, method, path, data=None, login=False):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.login = login
+
+
+SCENARIOS = [
+    Scenario('index', 'GET', '/'),
+    Scenario('contact', 'POST', '/contact',
+             data={'name': 'Bench', 'email': 'bench@example.com', 'message': 'Benchmark message'}),
+    Scenario('admin_dashboard', 'GET', '/admin/dashboard', login=True),
+    Scenario('admin_projects', 'GET', '/admin/projects', login=True),
+    Scenario('admin_skills', 'GET', '/admin/skills', login=True),
+    Scenario('admin_certifications', 'GET', '/admin/certifications', login=True),
+    Scenario('admin_blog', 'GET', '/admin/blog', login=True),
+    Scenario('admin_messages', 'GET', '/admin/messages', login=True),
+]
+
+LOGIN_FORM = {'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}
+
+
+# --- Drivers ---
+
+class TestClientDriver:
+    """In-process requests through app.test_client(); measures the app without any network."""
+
+    name = 'test-client'
+
+    def __init__(self, app):
+        self.app = app
+
+    def client(self, login):
+        client = self.app.test_client()
+        if login:
+            response = client.post('/admin/login', data=LOGIN_FORM)
+            if response.status_code != 302:
+                raise RuntimeError('benchmark login failed; seed the database with benchmarks.seed')
+        return client
+
+    def request(self, client, scenario):
+        response = client.open(scenario.path, method=scenario.method, data=scenario.data)
+        response.close()
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class WSGIServerDriver:
+    """Real HTTP requests against the app served by a local threaded Werkzeug server."""
+
+    name = 'wsgi'
+
+    def __init__(self, app):
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=_QuietRequestHandler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def client(self, login):
+        opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+        if login:
+            status = self._send(opener, 'POST', '/admin/login', LOGIN_FORM)
+            if status != 302:
+                raise RuntimeError('benchmark login failed; seed the database with benchmarks.seed')
+        return opener
+
+    def request(self, opener, scenario):
+        return self._send(opener, scenario.method, scenario.path, scenario.data)
+
+    def _send(self, opener, method, path, data):
+        body = urllib.parse.urlencode(data).encode() if data else None
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with opener.open(request, timeout=30) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            # Redirects surface as HTTPError because _NoRedirect does not follow them
+            e.read()
+            return e.code
+
+    def close(self):
+        self.server.shutdown()
+
+
+DRIVERS = {driver.name: driver for driver in (TestClientDriver, WSGIServerDriver)}
+
+
+# --- Measurement ---
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(1, int(-(-pct * len(ordered) // 100)))
+    return ordered[rank - 1]
+
+
+def run_scenario(driver, scenario, requests, warmup, concurrency):
+    """Returns the summary dict for one scenario."""
+    workers = max(1, concurrency)
+    clients = [driver.client(scenario.login) for _ in range(workers)]
+    for i in range(warmup):
+        driver.request(clients[i % workers], scenario)
+
+    per_worker = [requests // workers + (1 if i < requests % workers else 0) for i in range(workers)]
+
+    def worker(index):
+        client, timings, errors = clients[index], [], 0
+        for _ in range(per_worker[index]):
+            started = time.perf_counter()
+            status = driver.request(client, scenario)
+            timings.append((time.perf_counter() - started) * 1000)
+            errors += status >= 400
+        return timings, errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(worker, range(workers)))
+    elapsed = time.perf_counter() - started
+
+    timings = [t for worker_timings, _ in outcomes for t in worker_timings]
+    return {
+        'method': scenario.method,
+        'path': scenario.path,
+        'requests': len(timings),
+        'errors': sum(errors for _, errors in outcomes),
+        'throughput_rps': round(len(timings) / elapsed, 2),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'max_ms': round(max(timings), 3),
+    }
+
+
+def table_sizes():
+    """Row counts of the seeded tables, so results from different databases are not compared blindly."""
+    from extensions import db
+    from models import Project, Tag, Skill, Certification, BlogPost, Message, Visit
+
+    models = {'projects': Project, 'tags': Tag, 'skills': Skill, 'certifications': Certification,
+              'blog_posts': BlogPost, 'messages': Message, 'visits': Visit}
+    return {name: db.session.query(db.func.count(model.id)).scalar() for name, model in models.items()}
+
+
+def environment_info(app, args, sizes):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    config = app.config
+    return {
+        'format': RESULT_FORMAT,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'driver': args.driver,
+        'requests': args.requests,
+        'warmup': args.warmup,
+        'concurrency': args.concurrency,
+        'sizes': sizes,
+        'config': {name: config.get(name) for name in (
+            'VISIT_TRACKING_MODE', 'PAGE_CACHE_BACKEND', 'DASHBOARD_COUNTERS_MATERIALIZED', 'SEARCH_BACKEND',
+            'METRICS_ENABLED')},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', help='database seeded by benchmarks.seed; a throwaway one is seeded if omitted')
+    parser.add_argument('--driver', choices=sorted(DRIVERS), default='test-client')
+    parser.add_argument('--requests', type=int, default=500, help='measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='unmeasured requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=1, help='parallel clients per scenario')
+    parser.add_argument('--scenario', action='append', choices=[s.name for s in SCENARIOS],
+                        help='only run these scenarios (repeatable)')
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    add_size_arguments(parser)
+    parser.set_defaults(scale=0.1)
+    args = parser.parse_args(argv)
+
+    database = None
+    if args.db:
+        if not os.path.exists(args.db):
+            parser.error(f'{args.db} does not exist; create it with python -m benchmarks.seed')
+        # The scenarios write messages and visits; a copy keeps every run on the same data
+        database = os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+        shutil.copyfile(args.db, database)
+    configure_environment(database)
+
+    from app import create_app
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    # A failing page is reported as errors in the results rather than aborting the run
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+
+    with app.app_context():
+        if not args.db:
+            seed(sizes_from_args(args), log=lambda line: print(line, file=sys.stderr))
+        sizes = table_sizes()
+
+    driver = DRIVERS[args.driver](app)
+    results = {'environment': environment_info(app, args, sizes), 'scenarios': {}}
+    try:
+        for scenario in SCENARIOS:
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+            summary = run_scenario(driver, scenario, args.requests, args.warmup, args.concurrency)
+            results['scenarios'][scenario.name] = summary
+            print(f"{scenario.name:<22} {summary['throughput_rps']:9.1f} req/s  p50={summary['p50_ms']:8.2f}ms  "
+                  f"p95={summary['p95_ms']:8.2f}ms  p99={summary['p99_ms']:8.2f}ms  errors={summary['errors']}",
+                  file=sys.stderr)
+    finally:
+        driver.close()
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
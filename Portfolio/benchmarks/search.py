@@ -0,0 +1,121 @@
+"""
+Search benchmark over a generated corpus of blog posts.
+
+Seeds a throwaway SQLite database with synthetic posts, times a full
+`rebuild()` of the search index and then measures query latency for the
+FTS5 backend and the LIKE fallback on the same corpus.
+
+Usage:
+    python -m benchmarks.search [--posts 100000] [--queries 200] [--like-queries 20]
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks import configure_environment
+
+WORDS = (
+    'flask python sqlite cache index query latency template render request worker thread '
+    'deploy docker nginx gunicorn migration schema table column search snippet rank token '
+    'portfolio project design frontend backend api json http session cookie login admin '
+    'markdown blog post draft publish image upload resize css tailwind javascript async '
+    'queue batch stream export import backup restore metrics profile benchmark percentile'
+).split()
+# A long tail of rarer made-up words, like the vocabulary of real prose
+VOCABULARY = WORDS + [f'{word}{i}' for i in range(300) for word in WORDS]
+# Zipf's law: the word of rank r occurs with frequency proportional to 1/r
+CUM_WEIGHTS = list(itertools.accumulate(1 / rank for rank in range(1, len(VOCABULARY) + 1)))
+
+
+def pick_word(rng):
+    return rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS)[0]
+
+
+def pick_query_word(rng):
+    # The head of the distribution behaves like stop words; people search for the rest
+    return VOCABULARY[rng.randrange(20, 2000)]
+
+
+def make_text(rng, words):
+    return ' '.join(pick_word(rng) for _ in range(words))
+
+
+def seed(posts, batch_size=5000):
+    """Bulk-inserts `posts` synthetic blog posts."""
+    from extensions import db
+    from models import BlogPost
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    for start in range(0, posts, batch_size):
+        db.session.execute(db.insert(BlogPost), [
+            {'title': make_text(rng, 6).title(), 'content': make_text(rng, 200), 'author': 'Bench',
+             'slug': f'post-{i}', 'date_posted': now - timedelta(minutes=i)}
+            for i in range(start, min(start + batch_size, posts))])
+        db.session.commit()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_queries(search_index, queries):
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search_index.search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(label, timings):
+    print(f'{label:6} n={len(timings):<5} mean={statistics.mean(timings):8.2f}ms  '
+          f'p50={percentile(timings, 50):8.2f}ms  p95={percentile(timings, 95):8.2f}ms  '
+          f'max={max(timings):8.2f}ms')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100000, help='posts to generate')
+    parser.add_argument('--queries', type=int, default=200, help='queries to run against FTS5')
+    parser.add_argument('--like-queries', type=int, default=20, help='queries to run against the LIKE fallback')
+    args = parser.parse_args(argv)
+
+    configure_environment(os.path.join(tempfile.mkdtemp(), 'search_benchmark.db'))
+    os.environ['VISIT_TRACKING_MODE'] = 'sync'
+
+    from app import create_app
+    from search import search_index
+    app = create_app()
+
+    rng = random.Random(7)
+    queries = [' '.join(pick_query_word(rng) for _ in range(rng.choice((1, 1, 2, 3))))
+               for _ in range(args.queries)]
+    # Partial last words exercise prefix matching
+    queries += [pick_query_word(rng)[:4] for _ in range(args.queries // 10)]
+
+    with app.app_context():
+        started = time.perf_counter()
+        seed(args.posts)
+        print(f'Seeded {args.posts} posts in {time.perf_counter() - started:.1f}s')
+
+        started = time.perf_counter()
+        total = search_index.rebuild()
+        print(f'Indexed {total} documents ({search_index.backend}) in {time.perf_counter() - started:.1f}s')
+
+        if search_index.backend == 'fts5':
+            report('fts5', run_queries(search_index, queries))
+        search_index.backend = 'like'
+        report('like', run_queries(search_index, queries[:args.like_queries]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Fills every table in models.py with reproducible synthetic data.
+
+Usage:
+    python -m benchmarks.seed --db bench.db [--scale 1.0] [--projects 10000] [--visits 1000000] ...
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from benchmarks import configure_environment
+
+# Rows per model at --scale 1.0
+DEFAULT_SIZES = {
+    'projects': 10000,
+    'tags': 200,
+    'skills': 100,
+    'certifications': 1000,
+    'blog_posts': 10000,
+    'messages': 100000,
+    'visits': 1000000,
+}
+
+BENCH_USERNAME = 'bench'
+BENCH_PASSWORD = 'bench'
+
+LOREM = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut '
+         'labore et dolore magna aliqua flask python sqlite cache template query index').split()
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/124.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64) Firefox/125.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) Mobile/15E148',
+    'curl/8.5.0',
+]
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(LOREM) for _ in range(words))
+
+
+def _when(rng, now, days=365):
+    return now - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def _insert(model, rows, batch_size):
+    from extensions import db
+
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(db.insert(model), rows[start:start + batch_size])
+    db.session.commit()
+
+
+def _insert_generated(model, count, make_row, batch_size):
+    # Generated batch by batch so that a million visits never sit in memory at once
+    from extensions import db
+
+    for start in range(0, count, batch_size):
+        rows = [make_row(i) for i in range(start, min(start + batch_size, count))]
+        db.session.execute(db.insert(model), rows)
+        db.session.commit()
+
+
+def seed(sizes=None, batch_size=10000, seed_value=42, log=print):
+    """
+    Inserts synthetic rows for every model, then derives the rollups,
+    counters, rendered blog HTML and search index from them the same way the
+    app does. Expects an empty database. Returns the sizes used.
+    """
+    from extensions import db
+    from models import (User, Project, Tag, project_tag, Skill, Certification, Message,
+                        OutboxMessage, BlogPost, Visit)
+    from analytics import rollup_visits
+    from blog import rebuild_rendered_posts
+    from cache import bump_content_version
+    from counters import reconcile_counters
+    from search import search_index
+    from tags import reconcile_tag_counts
+
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    def step(label, func, *args):
+        started = time.perf_counter()
+        func(*args)
+        log(f'{label:<28} {time.perf_counter() - started:6.1f}s')
+
+    def users():
+        user = User(username=BENCH_USERNAME)
+        user.set_password(BENCH_PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+
+    def projects():
+        _insert_generated(Project, sizes['projects'], lambda i: {
+            'title': f'Project {i} {_text(rng, 3)}', 'description': _text(rng, 60),
+            'github_link': f'https://github.com/example/project-{i}', 'date_created': _when(rng, now),
+        }, batch_size)
+
+    def tags():
+        _insert(Tag, [{'name': f'Tag {i}', 'slug': f'tag-{i}', 'project_count': 0}
+                      for i in range(sizes['tags'])], batch_size)
+        if sizes['tags']:
+            rows = []
+            for project_id in range(1, sizes['projects'] + 1):
+                for tag_id in rng.sample(range(1, sizes['tags'] + 1), min(3, sizes['tags'])):
+                    rows.append({'project_id': project_id, 'tag_id': tag_id})
+            _insert(project_tag, rows, batch_size)
+            reconcile_tag_counts()
+
+    def skills():
+        categories = ['Programming Language', 'Framework', 'Database', 'Tooling']
+        _insert(Skill, [{'name': f'Skill {i}', 'level': rng.randrange(40, 101), 'category': rng.choice(categories)}
+                        for i in range(sizes['skills'])], batch_size)
+
+    def certifications():
+        _insert_generated(Certification, sizes['certifications'], lambda i: {
+            'name': f'Certification {i}', 'issuer': rng.choice(['AWS', 'Google', 'Microsoft', 'Coursera']),
+            'date_issued': _when(rng, now, 3650).date(),
+        }, batch_size)
+
+    def blog_posts():
+        _insert_generated(BlogPost, sizes['blog_posts'], lambda i: {
+            'title': f'Post {i} {_text(rng, 4)}', 'author': 'Bench', 'slug': f'post-{i}',
+            'content': f"# Post {i}\n\n{_text(rng, 120)}\n\n- {_text(rng, 8)}\n- {_text(rng, 8)}\n",
+            'date_posted': _when(rng, now),
+        }, batch_size)
+        rebuild_rendered_posts()
+
+    def messages():
+        _insert_generated(Message, sizes['messages'], lambda i: {
+            'name': f'Sender {i}', 'email': f'sender{i}@example.com', 'message': _text(rng, 40),
+            'timestamp': _when(rng, now), 'is_read': rng.random() < 0.9,
+        }, batch_size)
+        # Delivered notifications for every message, as the outbox would leave them
+        _insert_generated(OutboxMessage, sizes['messages'], lambda i: {
+            'message_id': i + 1, 'subject': f'New Portfolio Contact Message from Sender {i}', 'body': 'x',
+            'status': 'sent', 'attempts': 1, 'next_attempt_at': now, 'created_at': now, 'sent_at': now,
+        }, batch_size)
+
+    def visits():
+        # Sorted by time like real traffic, so ids follow timestamps
+        start = now - timedelta(days=30)
+        step_seconds = 30 * 86400 / max(sizes['visits'], 1)
+        _insert_generated(Visit, sizes['visits'], lambda i: {
+            'ip_address': f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}',
+            'user_agent': rng.choice(USER_AGENTS),
+            'timestamp': start + timedelta(seconds=i * step_seconds),
+        }, batch_size)
+        rollup_visits()
+
+    def derived():
+        reconcile_counters()
+        search_index.rebuild()
+        bump_content_version()
+        db.session.commit()
+
+    step('users', users)
+    step(f"projects ({sizes['projects']})", projects)
+    step(f"tags ({sizes['tags']})", tags)
+    step(f"skills ({sizes['skills']})", skills)
+    step(f"certifications ({sizes['certifications']})", certifications)
+    step(f"blog posts ({sizes['blog_posts']})", blog_posts)
+    step(f"messages ({sizes['messages']})", messages)
+    step(f"visits ({sizes['visits']})", visits)
+    step('counters and search index', derived)
+    db.session.execute(db.text('ANALYZE'))
+    return sizes
+
+
+def add_size_arguments(parser):
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplier applied to the default sizes')
+    for name, default in DEFAULT_SIZES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=None,
+                            help=f'rows to create (default {default} x scale)')
+
+
+def sizes_from_args(args):
+    return {
+        name: getattr(args, name) if getattr(args, name) is not None else int(default * args.scale)
+        for name, default in DEFAULT_SIZES.items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', required=True, help='SQLite file to create; must not exist yet')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42, help='random seed, for reproducible data')
+    add_size_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.db):
+        parser.error(f'{args.db} already exists')
+    configure_environment(args.db)
+
+    from app import create_app
+    app = create_app()
+    with app.app_context():
+        sizes = seed(sizes_from_args(args), args.batch_size, args.seed)
+    print(f'Seeded {args.db}: {sizes}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
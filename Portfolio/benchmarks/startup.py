@@ -0,0 +1,123 @@
+"""
+Cold-start benchmark: import time of app.py and the cost of create_app().
+
+Every run starts a fresh interpreter, the way an autoscaled worker does, and
+times `import app`, `create_app()` and the first request to / separately.
+The database is migrated once beforehand so that SCHEMA_MANAGEMENT=check
+finds it up to date.
+
+Usage:
+    python -m benchmarks.startup [--runs 10] [--schema create|check|none]...
+                                 [--importtime 15] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from benchmarks import configure_environment
+
+CHILD = r'''
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+status = application.test_client().get('/').status_code
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'factory_ms': (created - imported) * 1000,
+    'first_request_ms': (done - created) * 1000,
+    'total_ms': (done - start) * 1000,
+    'status': status,
+}))
+'''
+
+PHASES = ('import_ms', 'factory_ms', 'first_request_ms', 'total_ms')
+
+
+def run_child(env, importtime=False):
+    """Runs CHILD in a new interpreter; returns (timings, stderr)."""
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', CHILD]
+    result = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest_imports(stderr, count):
+    """Imports of the child and of app.py with the largest cumulative time from -X importtime, in ms."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nesting is shown by two spaces per level after the separator
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1 and name.strip() != 'app':
+            modules.append((name.strip(), int(cumulative) / 1000))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:count]
+
+
+def measure(env, runs):
+    samples = [run_child(env)[0] for _ in range(runs)]
+    summary = {}
+    for phase in PHASES:
+        values = [sample[phase] for sample in samples]
+        summary[phase] = {'median': round(statistics.median(values), 2), 'min': round(min(values), 2)}
+    summary['status'] = samples[-1]['status']
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='fresh interpreters per schema mode')
+    parser.add_argument('--schema', action='append', choices=['create', 'check', 'none'],
+                        help='SCHEMA_MANAGEMENT modes to compare (repeatable, default create and check)')
+    parser.add_argument('--importtime', type=int, default=0, metavar='N',
+                        help='also list the N slowest top-level imports')
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    configure_environment()
+    env = dict(os.environ, FLASK_APP='app.py', VISIT_TRACKING_MODE='sync')
+    subprocess.run([sys.executable, '-m', 'flask', 'db', 'upgrade'], env=env, capture_output=True, check=True)
+
+    results = {
+        'environment': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': args.runs,
+        },
+        'modes': {},
+    }
+    for mode in args.schema or ['create', 'check']:
+        mode_env = dict(env, SCHEMA_MANAGEMENT=mode)
+        run_child(mode_env)  # Warms the OS file cache and writes .pyc files
+        summary = measure(mode_env, args.runs)
+        if args.importtime:
+            summary['slowest_imports_ms'] = slowest_imports(run_child(mode_env, importtime=True)[1], args.importtime)
+        results['modes'][mode] = summary
+        print(f"{mode:<7} import={summary['import_ms']['median']:7.1f}ms  "
+              f"create_app={summary['factory_ms']['median']:7.1f}ms  "
+              f"first request={summary['first_request_ms']['median']:7.1f}ms  "
+              f"total={summary['total_ms']['median']:7.1f}ms", file=sys.stderr)
+        for name, ms in summary.get('slowest_imports_ms', []):
+            print(f'        {ms:7.1f}ms  {name}', file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
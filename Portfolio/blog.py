@@ -0,0 +1,98 @@
+import hashlib
+import threading
+
+from extensions import db
+from models import BlogPost
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'sane_lists']
+
+ALLOWED_TAGS = [
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 'strong', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+]
+ALLOWED_ATTRIBUTES = {
+    'a': ['href', 'title'],
+    'abbr': ['title'],
+    'code': ['class'],
+    'img': ['src', 'alt', 'title'],
+}
+
+# Neither Markdown instances nor bleach Cleaners are thread-safe, so each thread builds and reuses its own
+_local = threading.local()
+
+
+def content_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+def render_markdown(text):
+    """Converts Markdown to sanitized HTML."""
+    # Markdown and bleach are only needed when a post is saved, so they are not imported at startup
+    md = getattr(_local, 'markdown', None)
+    if md is None:
+        import markdown
+        md = _local.markdown = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+    cleaner = getattr(_local, 'cleaner', None)
+    if cleaner is None:
+        import bleach
+        cleaner = _local.cleaner = bleach.Cleaner(
+            tags=ALLOWED_TAGS,
+            attributes=ALLOWED_ATTRIBUTES,
+            protocols=['http', 'https', 'mailto'],
+            strip=True,
+        )
+    html = md.reset().convert(text or '')
+    return cleaner.clean(html)
+
+
+def render_post(post, force=False):
+    """
+    Stores the rendered HTML of a post's content, skipping the Markdown pass
+    when the content hash shows nothing changed. Returns True if re-rendered.
+    """
+    digest = content_hash(post.content)
+    if not force and post.content_html is not None and post.content_hash == digest:
+        return False
+    post.content_html = render_markdown(post.content)
+    post.content_hash = digest
+    return True
+
+
+def unique_slug(title, post_id=None):
+    """Slugifies `title`, appending -2, -3, ... if another post already uses the slug."""
+    from slugify import slugify
+
+    base = slugify(title)[:190] or 'post'
+    # A range on the slug index rather than LIKE, which SQLite cannot serve from an index
+    taken = {
+        slug for (slug,) in db.session.query(BlogPost.slug)
+        .filter(db.or_(BlogPost.slug == base, BlogPost.slug.between(f'{base}-', f'{base}.')))
+        .filter(BlogPost.id != post_id if post_id else db.true())
+    }
+    if base not in taken:
+        return base
+    suffix = 2
+    while f'{base}-{suffix}' in taken:
+        suffix += 1
+    return f'{base}-{suffix}'
+
+
+def rebuild_rendered_posts(force=False, batch_size=200):
+    """Re-renders every post whose cached HTML is missing or stale. Returns (checked, rendered)."""
+    checked = rendered = 0
+    last_id = 0
+    while True:
+        posts = (BlogPost.query
+                 .filter(BlogPost.id > last_id)
+                 .order_by(BlogPost.id)
+                 .limit(batch_size)
+                 .all())
+        if not posts:
+            break
+        for post in posts:
+            checked += 1
+            rendered += render_post(post, force=force)
+        last_id = posts[-1].id
+        db.session.commit()
+        db.session.expunge_all()
+    return checked, rendered
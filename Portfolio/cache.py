@@ -0,0 +1,209 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import make_response, request
+
+
+# --- Content Version Counter ---
+
+def get_content_version():
+    """Returns (version, updated_at) for the public content, (0, None) if nothing was saved yet."""
+    from extensions import db
+    from models import ContentVersion
+
+    row = db.session.get(ContentVersion, 1)
+    if row is None:
+        return 0, None
+    return row.version, row.updated_at
+
+
+def bump_content_version():
+    """
+    Marks public content as changed. Call before the admin route commits so the
+    bump lands in the same transaction as the change itself.
+    """
+    from extensions import db
+    from models import ContentVersion
+
+    now = datetime.utcnow()
+    updated = db.session.execute(
+        db.update(ContentVersion)
+        .where(ContentVersion.id == 1)
+        .values(version=ContentVersion.version + 1, updated_at=now)
+    ).rowcount
+    if not updated:
+        db.session.add(ContentVersion(id=1, version=1, updated_at=now))
+
+
+# --- Cache Backends ---
+
+class MemoryBackend:
+    """In-process LRU cache, private to each worker."""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._items.get(key)
+            if body is not None:
+                self._items.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        with self._lock:
+            self._items[key] = body
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+class SQLiteBackend:
+    """Cache stored in a SQLite file so that several workers can share rendered pages."""
+
+    def __init__(self, path, max_entries=128):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS page_cache '
+            '(key TEXT PRIMARY KEY, body BLOB NOT NULL, created REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._connect().execute('SELECT body FROM page_cache WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, body):
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO page_cache (key, body, created) VALUES (?, ?, ?)',
+            (key, body, time.time()),
+        )
+        # Evict the oldest entries beyond the limit
+        conn.execute(
+            'DELETE FROM page_cache WHERE key NOT IN '
+            '(SELECT key FROM page_cache ORDER BY created DESC LIMIT ?)',
+            (self.max_entries,),
+        )
+
+    def clear(self):
+        self._connect().execute('DELETE FROM page_cache')
+
+
+class NullBackend:
+    """Disables caching while keeping conditional request support."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, body):
+        pass
+
+    def clear(self):
+        pass
+
+
+# --- Page Cache ---
+
+class PageCache:
+    """
+    Caches fully rendered public pages keyed by the content version.
+
+    Admin saves bump the version, so stale entries are never served and simply
+    age out of the backend. Responses carry an ETag and Last-Modified derived
+    from the version, which lets repeat visitors get a 304 without a render.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullBackend()
+        self.fingerprint = ''
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('PAGE_CACHE_BACKEND', 'memory')
+        max_entries = app.config.get('PAGE_CACHE_MAX_ENTRIES', 128)
+        if backend == 'memory':
+            self.backend = MemoryBackend(max_entries)
+        elif backend == 'sqlite':
+            path = app.config.get('PAGE_CACHE_PATH') or os.path.join(app.instance_path, 'page_cache.db')
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.backend = SQLiteBackend(path, max_entries)
+        elif backend == 'none':
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"Unknown PAGE_CACHE_BACKEND: {backend}")
+        self.fingerprint = self._template_fingerprint(app)
+        app.extensions['page_cache'] = self
+
+    def respond(self, name, render):
+        """
+        Returns a response for the page `name`, calling `render()` only when
+        neither the client nor the backend has the current version.
+        """
+        version, last_modified = get_content_version()
+        key = f'{name}:{version}:{datetime.utcnow().year}:{self.fingerprint}'
+        etag = hashlib.sha1(key.encode()).hexdigest()[:20]
+
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            body = self.backend.get(key)
+            if body is None:
+                self.misses += 1
+                body = render().encode('utf-8')
+                self.backend.set(key, body)
+            else:
+                self.hits += 1
+            response = make_response(body)
+
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def clear(self):
+        self.backend.clear()
+
+    @staticmethod
+    def _template_fingerprint(app):
+        # Template edits or an asset rebuild on deploy must change the ETag even if the content did not
+        digest = hashlib.sha1()
+        template_root = os.path.join(app.root_path, app.template_folder)
+        for root, _, files in sorted(os.walk(template_root)):
+            for filename in sorted(files):
+                with open(os.path.join(root, filename), 'rb') as f:
+                    digest.update(filename.encode() + f.read())
+        manifest = os.path.join(app.static_folder, 'dist', 'manifest.json')
+        if os.path.exists(manifest):
+            with open(manifest, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()[:8]
+
+
+page_cache = PageCache()
@@ -0,0 +1,126 @@
+import click
+from flask.cli import AppGroup
+
+portfolio_cli = AppGroup('portfolio', help='Portfolio maintenance commands.')
+
+
+@portfolio_cli.command('send-mail')
+def send_mail():
+    """Delivers pending contact notifications from the email outbox."""
+    from outbox import mail_outbox
+
+    sent = mail_outbox.send_pending()
+    click.echo(f'Sent {sent} notification(s).')
+
+
+@portfolio_cli.command('rollup-visits')
+@click.option('--prune/--no-prune', default=True, help='Delete raw visits older than VISIT_RETENTION_DAYS.')
+@click.option('--retention-days', type=int, default=None, help='Override VISIT_RETENTION_DAYS.')
+def rollup_visits_command(prune, retention_days):
+    """Aggregates new visits into the analytics rollups."""
+    from analytics import rollup_visits, prune_visits
+
+    processed = rollup_visits()
+    click.echo(f'Rolled up {processed} visit(s).')
+    if prune:
+        deleted = prune_visits(retention_days)
+        click.echo(f'Pruned {deleted} raw visit(s).')
+
+
+@portfolio_cli.command('reconcile-counters')
+def reconcile_counters_command():
+    """Recomputes the dashboard counters and tag counts from the tables."""
+    from counters import reconcile_counters
+    from tags import reconcile_tag_counts
+
+    reconcile_tag_counts()
+    counts, drift = reconcile_counters()
+    for name, (old, new) in drift.items():
+        click.echo(f'{name}: {old} -> {new}')
+    click.echo(f'Counters: {counts}' if not drift else f'Corrected {len(drift)} counter(s).')
+
+
+@portfolio_cli.command('render-posts')
+@click.option('--force', is_flag=True, help='Re-render every post, even if its content is unchanged.')
+def render_posts_command(force):
+    """Pre-renders the Markdown of blog posts into stored HTML."""
+    from blog import rebuild_rendered_posts
+
+    checked, rendered = rebuild_rendered_posts(force=force)
+    click.echo(f'Rendered {rendered} of {checked} post(s).')
+
+
+@portfolio_cli.command('rebuild-search')
+def rebuild_search_command():
+    """Regenerates the search index from the projects and blog posts."""
+    from search import search_index
+
+    total = search_index.rebuild()
+    click.echo(f'Indexed {total} document(s) using {search_index.backend}.')
+
+
+@portfolio_cli.command('build-assets')
+@click.option('--tailwind', default=None, help='Tailwind CLI executable (default: TAILWIND_CLI).')
+def build_assets_command(tailwind):
+    """Compiles, fingerprints and precompresses the CSS bundle into static/dist."""
+    from assets import asset_pipeline
+
+    manifest = asset_pipeline.build(tailwind)
+    click.echo(f'Built {len(manifest)} bundle(s).')
+
+
+@portfolio_cli.command('process-images')
+@click.option('--workers', type=int, default=None, help='Worker processes (default: one per CPU).')
+@click.option('--force', is_flag=True, help='Regenerate derivatives that already exist.')
+@click.option('--fetch-remote', is_flag=True, help='Download remote project Image URLs and store them too.')
+def process_images_command(workers, force, fetch_remote):
+    """Imports static and remote images and builds their resized WebP/JPEG copies."""
+    from images import image_processor
+
+    processed, failed = image_processor.backfill(workers=workers, force=force, fetch_remote=fetch_remote, log=click.echo)
+    click.echo(f'Processed {processed} image(s), {failed} failed.')
+
+
+@portfolio_cli.command('freeze')
+@click.argument('output', required=False)
+def freeze_command(output):
+    """Renders the index page and every blog post to OUTPUT (default: STATIC_EXPORT_DIR) for the front server."""
+    from static_site import static_site
+
+    count = static_site.freeze(output, log=click.echo)
+    click.echo(f'Wrote {count} page(s) to {output or static_site.output_dir}.')
+
+
+@portfolio_cli.command('export')
+@click.argument('path', default='-')
+@click.option('--table', 'tables', multiple=True, help='Only export this table (repeatable).')
+@click.option('--batch-size', type=int, default=1000, show_default=True, help='Rows read per query.')
+def export_command(path, tables, batch_size):
+    """Writes the portfolio content to PATH as NDJSON (stdout by default, gzip for *.gz)."""
+    from transfer import TABLES_BY_NAME, export_content
+
+    unknown = set(tables) - set(TABLES_BY_NAME)
+    if unknown:
+        raise click.BadParameter(f"unknown table(s) {', '.join(sorted(unknown))}; "
+                                 f"choose from {', '.join(TABLES_BY_NAME)}", param_hint='--table')
+    counts = export_content(path, tables=set(tables) or None, batch_size=batch_size,
+                            log=lambda line: click.echo(line, err=True))
+    click.echo(f'Exported {sum(counts.values())} row(s).', err=True)
+
+
+@portfolio_cli.command('import')
+@click.argument('path', default='-')
+@click.option('--batch-size', type=int, default=500, show_default=True, help='Rows per transaction.')
+@click.option('--resume', is_flag=True, help='Continue an interrupted import of the same file.')
+def import_command(path, batch_size, resume):
+    """Loads an NDJSON export, updating rows that already exist by their natural key."""
+    from transfer import TransferError, import_content
+
+    try:
+        counts = import_content(path, batch_size=batch_size, resume=resume,
+                                log=lambda line: click.echo(line, err=True))
+    except TransferError as e:
+        raise click.ClickException(str(e))
+    for name, count in counts.items():
+        click.echo(f'{name}: {count}')
+    click.echo(f'Imported {sum(counts.values())} row(s).')
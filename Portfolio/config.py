@@ -1,7 +1,8 @@
 import os
 from dotenv import load_dotenv
+from database import engine_options
 
-# Load environment variables from a .env file
+# Load environment variables from a .env file; this is the only place that does it
 load_dotenv()
 
 class Config:
@@ -9,6 +10,17 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'a_very_secret_key')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # SQLite pragmas applied to every connection; an empty SQLITE_JOURNAL_MODE leaves the file's mode alone
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'wal')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'normal')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # Milliseconds a writer waits for the lock
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))  # Bytes, 0 disables memory mapping
+    SQLITE_FOREIGN_KEYS = os.environ.get('SQLITE_FOREIGN_KEYS', 'on')  # Enforces the ON DELETE actions of the models
+
+    # Startup schema handling: 'create' runs db.create_all(), 'check' only compares the
+    # Flask-Migrate revision with migrations/ (no DDL, faster cold starts), 'none' skips both
+    SCHEMA_MANAGEMENT = os.environ.get('SCHEMA_MANAGEMENT', 'create')
+
     # Email configuration
     MAIL_SERVER = os.environ.get('MAIL_SERVER', 'smtp.gmail.com')
     MAIL_PORT = int(os.environ.get('MAIL_PORT', 587))
@@ -17,11 +29,80 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', MAIL_USERNAME)
 
+    # Visit tracking: 'buffered' writes visits in the background, 'sync' commits on every request
+    VISIT_TRACKING_MODE = os.environ.get('VISIT_TRACKING_MODE', 'buffered')
+    VISIT_BUFFER_SIZE = int(os.environ.get('VISIT_BUFFER_SIZE', 10000))
+    VISIT_FLUSH_BATCH = int(os.environ.get('VISIT_FLUSH_BATCH', 500))
+    VISIT_FLUSH_INTERVAL = float(os.environ.get('VISIT_FLUSH_INTERVAL', 5.0))
+
+    # Visit analytics: raw visits are rolled up into hourly/daily tables, then pruned
+    VISIT_ROLLUP_INTERVAL = int(os.environ.get('VISIT_ROLLUP_INTERVAL', 300))  # Seconds, 0 disables the background rollup
+    VISIT_ROLLUP_BATCH = int(os.environ.get('VISIT_ROLLUP_BATCH', 10000))
+    VISIT_RETENTION_DAYS = int(os.environ.get('VISIT_RETENTION_DAYS', 90))
+
+    # Rendered page cache: 'memory' (per worker), 'sqlite' (shared file) or 'none'
+    PAGE_CACHE_BACKEND = os.environ.get('PAGE_CACHE_BACKEND', 'memory')
+    PAGE_CACHE_MAX_ENTRIES = int(os.environ.get('PAGE_CACHE_MAX_ENTRIES', 128))
+    PAGE_CACHE_PATH = os.environ.get('PAGE_CACHE_PATH')  # Defaults to instance/page_cache.db
+
+    # Admin list views use keyset pagination; ?per_page= is capped at ADMIN_MAX_PAGE_SIZE
+    ADMIN_PAGE_SIZE = int(os.environ.get('ADMIN_PAGE_SIZE', 25))
+    ADMIN_MAX_PAGE_SIZE = int(os.environ.get('ADMIN_MAX_PAGE_SIZE', 200))
+
+    # JSON API: /api/v1 is served from a snapshot rebuilt after admin changes; clients revalidate with ETags
+    API_MAX_AGE = int(os.environ.get('API_MAX_AGE', 0))  # Seconds a response may be reused without asking, 0 always revalidates
+    API_GZIP_MIN_SIZE = int(os.environ.get('API_GZIP_MIN_SIZE', 500))  # Smaller bodies are sent uncompressed
+    API_CACHE_MAX_ENTRIES = int(os.environ.get('API_CACHE_MAX_ENTRIES', 64))  # Encoded responses per worker
+    API_CORS_ORIGINS = [o.strip() for o in os.environ.get('API_CORS_ORIGINS', '').split(',') if o.strip()]  # '*' for any
+
+    # Static export: `flask portfolio freeze` writes the public pages here; admin saves then regenerate them
+    STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR')  # Defaults to instance/site
+    STATIC_EXPORT_REGENERATE = os.environ.get('STATIC_EXPORT_REGENERATE', 'true').lower() in ['true', 'on', '1']
+
+    # Posts per page on the public /blog archive
+    BLOG_PAGE_SIZE = int(os.environ.get('BLOG_PAGE_SIZE', 10))
+
+    # Search: 'auto' uses SQLite FTS5 when available, 'like' forces the portable fallback
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+    SEARCH_RESULTS_LIMIT = int(os.environ.get('SEARCH_RESULTS_LIMIT', 20))
+
+    # Request instrumentation: Server-Timing headers and /admin/metrics; when off no hooks are installed
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ['true', 'on', '1']
+    METRICS_SERVER_TIMING = os.environ.get('METRICS_SERVER_TIMING', 'true').lower() in ['true', 'on', '1']
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token that lets Prometheus scrape without a login
+
+    # Tailwind standalone CLI used by `flask portfolio build-assets`
+    TAILWIND_CLI = os.environ.get('TAILWIND_CLI', 'tailwindcss')
+
+    # Uploaded images: resized WebP/JPEG derivatives are generated by a background thread pool
+    IMAGE_WIDTHS = [int(w) for w in os.environ.get('IMAGE_WIDTHS', '320,640,960,1280').split(',')]
+    IMAGE_QUALITY = int(os.environ.get('IMAGE_QUALITY', 80))
+    IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+    IMAGE_MAX_BYTES = int(os.environ.get('IMAGE_MAX_MB', 10)) * 1024 * 1024
+    MAX_CONTENT_LENGTH = IMAGE_MAX_BYTES + 1024 * 1024  # Leaves room for the other form fields
+
+    # Dashboard counters are kept in a table updated with each insert/delete; false counts live
+    DASHBOARD_COUNTERS_MATERIALIZED = os.environ.get('DASHBOARD_COUNTERS_MATERIALIZED', 'true').lower() in ['true', 'on', '1']
+
+    # Email outbox: contact notifications are sent by a background worker
+    MAIL_OUTBOX_WORKER = os.environ.get('MAIL_OUTBOX_WORKER', 'true').lower() in ['true', 'on', '1']
+    MAIL_OUTBOX_BATCH = int(os.environ.get('MAIL_OUTBOX_BATCH', 20))
+    MAIL_OUTBOX_POLL_INTERVAL = float(os.environ.get('MAIL_OUTBOX_POLL_INTERVAL', 30))
+    MAIL_OUTBOX_LEASE = int(os.environ.get('MAIL_OUTBOX_LEASE', 300))  # Seconds a claimed batch stays with one worker
+    MAIL_MAX_ATTEMPTS = int(os.environ.get('MAIL_MAX_ATTEMPTS', 5))
+    MAIL_RETRY_BACKOFF = int(os.environ.get('MAIL_RETRY_BACKOFF', 60))  # Seconds, doubled on each attempt
+
+    # Logged-in admin identities are cached by the user loader; 0 looks the user up on every request
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 64))
+    USER_CACHE_STAMP = os.environ.get('USER_CACHE_STAMP')  # Touched on user changes, defaults to instance/user_cache.stamp
+
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URL', 'sqlite:///portfolio_dev.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, os.environ)
 
 
 class ProductionConfig(Config):
@@ -30,6 +111,10 @@ class ProductionConfig(Config):
     # For production, you would switch to something like PostgreSQL
     # The DATABASE_URL env var is used by services like Heroku, Railway, Render
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///portfolio_prod.db')
+    # Pool settings for server databases, a lock wait for SQLite (see database.py)
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, os.environ)
+    # Production databases are upgraded with `flask db upgrade` when deploying
+    SCHEMA_MANAGEMENT = os.environ.get('SCHEMA_MANAGEMENT', 'check')
 
     # Example for PostgreSQL:
     # SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', '').replace('postgres://', 'postgresql://')
@@ -0,0 +1,109 @@
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import Project, Skill, Certification, Message, DashboardCounter
+
+# Counter name for each model whose rows are counted on the dashboard
+COUNTED_MODELS = {
+    Project: 'projects',
+    Skill: 'skills',
+    Certification: 'certifications',
+    Message: 'messages',
+}
+COUNTER_NAMES = ['projects', 'skills', 'certifications', 'messages', 'unread_messages']
+
+
+def _materialized():
+    return current_app.config.get('DASHBOARD_COUNTERS_MATERIALIZED', True)
+
+
+def live_counts():
+    """Computes every dashboard figure with a single aggregate query."""
+    def count(model, *conditions):
+        return db.select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+
+    row = db.session.execute(db.select(
+        count(Project).label('projects'),
+        count(Skill).label('skills'),
+        count(Certification).label('certifications'),
+        count(Message).label('messages'),
+        count(Message, Message.is_read == False).label('unread_messages'),  # noqa: E712
+    )).one()
+    return dict(row._mapping)
+
+
+def dashboard_counts():
+    """
+    Returns the dashboard figures in one round trip: from the materialized
+    counters when enabled, otherwise from the live aggregate query. Missing
+    counter rows are rebuilt on the spot.
+    """
+    if not _materialized():
+        return live_counts()
+    counts = dict(db.session.execute(db.select(DashboardCounter.name, DashboardCounter.value)).all())
+    if any(name not in counts for name in COUNTER_NAMES):
+        return reconcile_counters()[0]
+    return counts
+
+
+def adjust_counters(**deltas):
+    """
+    Applies deltas like adjust_counters(messages=1) to the materialized
+    counters. Call before the route commits so the counters change in the
+    same transaction as the rows they count.
+    """
+    if not _materialized():
+        return
+    for name, delta in deltas.items():
+        if delta:
+            db.session.execute(
+                db.update(DashboardCounter)
+                .where(DashboardCounter.name == name)
+                .values(value=DashboardCounter.value + delta)
+            )
+
+
+def track_added(item):
+    """Counts a newly added row, if its model is counted."""
+    _track(item, 1)
+
+
+def track_deleted(item):
+    """Uncounts a deleted row, if its model is counted."""
+    _track(item, -1)
+
+
+def _track(item, delta):
+    name = COUNTED_MODELS.get(type(item))
+    if name is None:
+        return
+    deltas = {name: delta}
+    if isinstance(item, Message) and not item.is_read:
+        deltas['unread_messages'] = delta
+    adjust_counters(**deltas)
+
+
+def reconcile_counters():
+    """
+    Recomputes every counter from the tables to repair drift.
+    Returns (counts, drift) where drift maps each corrected name to (old, new).
+    """
+    counts = live_counts()
+    existing = {c.name: c for c in DashboardCounter.query.all()}
+    drift = {}
+    for name, value in counts.items():
+        counter = existing.get(name)
+        if counter is None:
+            db.session.add(DashboardCounter(name=name, value=value))
+            drift[name] = (None, value)
+        elif counter.value != value:
+            drift[name] = (counter.value, value)
+            counter.value = value
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker created the rows first
+        db.session.rollback()
+    return counts, drift
@@ -0,0 +1,48 @@
+from sqlalchemy import event
+
+
+def engine_options(uri, env):
+    """SQLALCHEMY_ENGINE_OPTIONS for `uri`, read from the DB_POOL_* variables in `env`."""
+    if uri.startswith('sqlite'):
+        # SQLite is tuned through the pragmas in sqlite_pragmas() instead
+        return {}
+    return {
+        'pool_size': int(env.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(env.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(env.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(env.get('DB_POOL_RECYCLE', 1800)),  # Below typical server/proxy idle timeouts
+        'pool_pre_ping': env.get('DB_POOL_PRE_PING', 'true').lower() in ['true', 'on', '1'],
+    }
+
+
+def sqlite_pragmas(config):
+    """The PRAGMA statements run on every new SQLite connection."""
+    pragmas = [
+        ('journal_mode', config.get('SQLITE_JOURNAL_MODE', 'wal')),
+        ('synchronous', config.get('SQLITE_SYNCHRONOUS', 'normal')),
+        ('busy_timeout', int(config.get('SQLITE_BUSY_TIMEOUT', 5000))),
+        ('mmap_size', int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))),
+        # Off by default in SQLite, which would ignore every ON DELETE CASCADE/SET NULL of the models
+        ('foreign_keys', config.get('SQLITE_FOREIGN_KEYS', 'on')),
+    ]
+    return [f'PRAGMA {name}={value}' for name, value in pragmas if value not in (None, '')]
+
+
+def init_engines(app):
+    """Installs the SQLite connect hook on every engine of `db`. Call right after db.init_app()."""
+    from extensions import db
+
+    statements = sqlite_pragmas(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name != 'sqlite' or not statements:
+                continue
+
+            @event.listens_for(engine, 'connect')
+            def apply_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                try:
+                    for statement in statements:
+                        cursor.execute(statement)
+                finally:
+                    cursor.close()
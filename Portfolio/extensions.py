@@ -1,8 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from flask_migrate import Migrate
 
 # Create extension instances
 db = SQLAlchemy()
 login_manager = LoginManager()
-migrate = Migrate()
+
+
+def init_migrate(app):
+    """
+    Sets up Flask-Migrate and its `flask db` commands. It is imported here
+    rather than at module level because it pulls in Alembic, which web
+    workers in SCHEMA_MANAGEMENT=check mode never use.
+    """
+    from flask_migrate import Migrate
+
+    return Migrate(app, db)
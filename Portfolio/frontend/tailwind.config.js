@@ -0,0 +1,44 @@
+/**
+ * Tailwind CSS configuration for `flask portfolio build-assets`.
+ * Same theme the pages used with the Play CDN; `content` lists the files
+ * scanned for class names, everything else is purged from the bundle.
+ */
+module.exports = {
+    darkMode: 'class',
+    content: ['./templates/**/*.html'],
+    theme: {
+        extend: {
+            fontFamily: {
+                sans: ['Inter', 'ui-sans-serif', 'system-ui', '-apple-system', 'Segoe UI', 'Roboto', 'sans-serif'],
+            },
+            colors: {
+                'primary': {
+                    '50': '#eef2ff',
+                    '100': '#e0e7ff',
+                    '200': '#c7d2fe',
+                    '300': '#a5b4fc',
+                    '400': '#818cf8',
+                    '500': '#6366f1',
+                    '600': '#4f46e5',
+                    '700': '#4338ca',
+                    '800': '#3730a3',
+                    '900': '#312e81',
+                }
+            },
+            keyframes: {
+                'spin-20s': {
+                    '0%': { transform: 'rotate(0deg)' },
+                    '100%': { transform: 'rotate(360deg)' },
+                },
+                'spin-medium': {
+                    '0%': { transform: 'rotate(0deg)' },
+                    '100%': { transform: 'rotate(360deg)' },
+                }
+            },
+            animation: {
+                'spin-20s': 'spin-20s 20s linear infinite',
+                'spin-medium': 'spin-medium 15s linear infinite',
+            }
+        }
+    }
+}
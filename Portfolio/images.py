@@ -0,0 +1,332 @@
+import atexit
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from flask import abort, send_from_directory, url_for
+
+from assets import IMMUTABLE
+from runtime import ProcessLocal, atomic_path, write_atomic
+
+ALLOWED_EXTENSIONS = {'jpg', 'jpeg', 'png', 'webp', 'gif'}
+# Pillow format name -> extension of the stored original
+ORIGINAL_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+# Derivative formats: (extension, Pillow format, mime type)
+DERIVATIVE_FORMATS = (('webp', 'WEBP', 'image/webp'), ('jpg', 'JPEG', 'image/jpeg'))
+
+
+def image_directory(root, sha256):
+    return os.path.join(root, sha256[:2], sha256)
+
+
+def derivative_name(width, extension):
+    return f'w{width}.{extension}'
+
+
+def _save_atomic(image, path, **options):
+    with atomic_path(path) as tmp:
+        image.save(tmp, **options)
+
+
+def generate_derivatives(directory, original, widths, quality, force=False):
+    """
+    Writes WebP and JPEG copies of `directory/original` at each width that is
+    not larger than the original. Needs no app context, so it can run in a
+    worker process. Returns (width, height, generated widths).
+    """
+    from PIL import Image as PILImage, ImageOps
+
+    with PILImage.open(os.path.join(directory, original)) as source:
+        source = ImageOps.exif_transpose(source)
+        width, height = source.size
+        has_alpha = source.mode in ('RGBA', 'LA') or 'transparency' in source.info
+        source = source.convert('RGBA' if has_alpha else 'RGB')
+        # Never upscale; an image narrower than every width gets one derivative at its own size
+        targets = sorted({min(target, width) for target in widths})
+        for target in targets:
+            resized = source if target == width else source.resize(
+                (target, max(1, round(height * target / width))), PILImage.LANCZOS)
+            for extension, pil_format, _ in DERIVATIVE_FORMATS:
+                path = os.path.join(directory, derivative_name(target, extension))
+                if os.path.exists(path) and not force:
+                    continue
+                if pil_format == 'JPEG':
+                    flat = resized
+                    if has_alpha:
+                        flat = PILImage.new('RGB', resized.size, (255, 255, 255))
+                        flat.paste(resized, mask=resized.getchannel('A'))
+                    _save_atomic(flat, path, format='JPEG', quality=quality, optimize=True, progressive=True)
+                else:
+                    _save_atomic(resized, path, format='WEBP', quality=quality, method=6)
+    return width, height, targets
+
+
+def _derive_task(args):
+    # Top-level so that ProcessPoolExecutor can pickle it
+    image_id = args[0]
+    try:
+        return image_id, generate_derivatives(*args[1:]), None
+    except Exception as e:
+        return image_id, None, str(e)
+
+
+def detect_extension(data):
+    """Returns the extension for image bytes, or raises ValueError if they are not a supported image."""
+    from PIL import Image as PILImage, UnidentifiedImageError
+
+    try:
+        with PILImage.open(io.BytesIO(data)) as probe:
+            probe.verify()
+            image_format = probe.format
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise ValueError(f'not a readable image: {e}') from e
+    if image_format not in ORIGINAL_FORMATS:
+        raise ValueError(f'unsupported image format {image_format}')
+    return ORIGINAL_FORMATS[image_format]
+
+
+class ImageProcessor:
+    """
+    Stores uploaded images content-addressed under static/media and builds
+    their resized WebP/JPEG derivatives.
+
+    Uploads are processed by a small thread pool after the admin route
+    commits; until the derivatives exist the templates show the original.
+    `flask portfolio process-images` backfills existing images with a
+    process pool.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._executor = ProcessLocal(
+            lambda: ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='images'))
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.root = os.path.join(app.static_folder, 'media')
+        self.widths = app.config.get('IMAGE_WIDTHS', [320, 640, 960, 1280])
+        self.quality = app.config.get('IMAGE_QUALITY', 80)
+        self.workers = app.config.get('IMAGE_WORKERS', 2)
+        self.max_bytes = app.config.get('IMAGE_MAX_BYTES', 10 * 1024 * 1024)
+        app.add_url_rule(f'{app.static_url_path}/media/<path:filename>', 'media', self.serve)
+        app.add_template_global(self.image_src, 'image_src')
+        app.add_template_global(self.image_srcset, 'image_srcset')
+        app.add_template_global(self.static_image, 'static_image')
+        app.extensions['image_processor'] = self
+        atexit.register(self.shutdown)
+
+    # --- Storing ---
+
+    def store(self, data, source=None):
+        """
+        Saves image bytes under their SHA-256 and returns the Image row, reusing
+        an existing one for identical content. The caller commits.
+        """
+        from extensions import db
+        from models import Image
+
+        if len(data) > self.max_bytes:
+            raise ValueError(f'image is larger than {self.max_bytes // (1024 * 1024)} MB')
+        sha256 = hashlib.sha256(data).hexdigest()
+        image = Image.query.filter_by(sha256=sha256).first()
+        if image is not None:
+            return image
+
+        extension = detect_extension(data)
+        directory = image_directory(self.root, sha256)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'original.{extension}')
+        if not os.path.exists(path):
+            write_atomic(path, data)
+        image = Image(sha256=sha256, extension=extension, source=(source or '')[:500] or None)
+        db.session.add(image)
+        return image
+
+    def check_upload(self, file_storage):
+        """Raises ValueError unless a form upload is a supported image within IMAGE_MAX_BYTES."""
+        data = file_storage.read(self.max_bytes + 1)
+        file_storage.seek(0)
+        if len(data) > self.max_bytes:
+            raise ValueError(f'image is larger than {self.max_bytes // (1024 * 1024)} MB')
+        detect_extension(data)
+
+    def store_upload(self, file_storage):
+        """Stores a Werkzeug FileStorage from a form upload."""
+        return self.store(file_storage.read(self.max_bytes + 1), source=file_storage.filename)
+
+    # --- Processing ---
+
+    def process(self, image, force=False):
+        """Generates the derivatives of `image` in the calling thread and updates the row."""
+        directory = image_directory(self.root, image.sha256)
+        result = _derive_task((image.id, directory, f'original.{image.extension}', self.widths, self.quality, force))
+        self._apply(image, result[1], result[2])
+
+    def submit(self, image_id):
+        """Queues derivative generation for a committed Image row."""
+        self._executor.get().submit(self._process_in_background, image_id)
+
+    def backfill(self, workers=None, force=False, fetch_remote=False, log=print):
+        """
+        Imports images that are not stored yet (files in static/images and,
+        with `fetch_remote`, the remote Project.image_url links), then builds
+        derivatives for every image that needs them using a process pool.
+        Returns (processed, failed).
+        """
+        from extensions import db
+        from models import Image
+
+        self._import_static_images(log)
+        if fetch_remote:
+            self._import_remote_images(workers, log)
+        db.session.commit()
+
+        query = Image.query if force else Image.query.filter(Image.status != 'ready')
+        images = {image.id: image for image in query.order_by(Image.id)}
+        tasks = [(image.id, image_directory(self.root, image.sha256), f'original.{image.extension}',
+                  self.widths, self.quality, force) for image in images.values()]
+        processed = failed = 0
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for image_id, result, error in pool.map(_derive_task, tasks):
+                self._apply(images[image_id], result, error)
+                processed += 1
+                failed += error is not None
+                if error:
+                    log(f'image {image_id}: {error}')
+        self._bump_content()
+        db.session.commit()
+        return processed, failed
+
+    def shutdown(self):
+        executor = self._executor.reset()
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    # --- Templates ---
+
+    def image_src(self, image, extension='jpg', width=960):
+        """URL of the derivative closest to `width`, or of the original while derivatives are pending."""
+        widths = image.derivative_widths if image.status == 'ready' else []
+        if not widths:
+            return self._url(image, f'original.{image.extension}')
+        best = min(widths, key=lambda candidate: (candidate < width, abs(candidate - width)))
+        return self._url(image, derivative_name(best, extension))
+
+    def image_srcset(self, image, extension):
+        return ', '.join(f'{self._url(image, derivative_name(width, extension))} {width}w'
+                         for width in image.derivative_widths)
+
+    def static_image(self, path):
+        """The processed Image for a file in static/, or None if it has not been imported."""
+        from models import Image
+
+        return Image.query.filter_by(source=f'static:{path}').first()
+
+    def serve(self, filename):
+        """Sends a stored image; names are content hashes, so they are cached for good."""
+        if os.path.basename(filename).startswith('.'):
+            abort(404)
+        response = send_from_directory(self.root, filename)
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    # --- Internal helpers ---
+
+    def _url(self, image, name):
+        return url_for('media', filename=f'{image.sha256[:2]}/{image.sha256}/{name}')
+
+    def _apply(self, image, result, error):
+        if error is None:
+            image.width, image.height, widths = result
+            image.widths = ','.join(str(width) for width in widths)
+            image.status, image.error = 'ready', None
+        else:
+            image.status, image.error = 'failed', error[:255]
+            self.app.logger.warning(f'Could not process image {image.id}: {error}')
+
+    @staticmethod
+    def _bump_content():
+        # Cached pages embed the image URLs, so they must be rendered again
+        from cache import bump_content_version
+        bump_content_version()
+
+    def _process_in_background(self, image_id):
+        from extensions import db
+        from models import Image
+        from static_site import static_site
+
+        with self.app.app_context():
+            try:
+                image = db.session.get(Image, image_id)
+                if image is None or image.status == 'ready':
+                    return
+                self.process(image)
+                self._bump_content()
+                db.session.commit()
+                # A frozen index page links the original until it is rendered again with the srcset
+                static_site.schedule('index')
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.error(f'Image worker error for image {image_id}: {e}')
+
+    def _import_static_images(self, log):
+        from models import Image
+
+        folder = os.path.join(self.app.static_folder, 'images')
+        if not os.path.isdir(folder):
+            return
+        for name in sorted(os.listdir(folder)):
+            if name.rsplit('.', 1)[-1].lower() not in ALLOWED_EXTENSIONS:
+                continue
+            source = f'static:images/{name}'
+            with open(os.path.join(folder, name), 'rb') as f:
+                data = f.read()
+            existing = Image.query.filter_by(source=source).first()
+            if existing is not None and existing.sha256 == hashlib.sha256(data).hexdigest():
+                continue
+            if existing is not None:
+                # The file was replaced; the new content gets its own row
+                existing.source = None
+            try:
+                self.store(data, source=source)
+                log(f'imported {source}')
+            except ValueError as e:
+                log(f'skipped {source}: {e}')
+
+    def _import_remote_images(self, workers, log):
+        from extensions import db
+        from models import Project
+
+        projects = (Project.query
+                    .filter(Project.image_id.is_(None), Project.image_url.like('http%'))
+                    .order_by(Project.id)
+                    .all())
+
+        import urllib.request
+
+        def fetch(url):
+            try:
+                request = urllib.request.Request(url, headers={'User-Agent': 'portfolio-image-backfill'})
+                with urllib.request.urlopen(request, timeout=15) as response:
+                    return response.read(self.max_bytes + 1), None
+            except Exception as e:
+                return None, str(e)
+
+        # Downloads are I/O-bound, so threads are enough here
+        with ThreadPoolExecutor(max_workers=workers or 8) as pool:
+            downloads = list(pool.map(fetch, [project.image_url for project in projects]))
+        for project, (data, error) in zip(projects, downloads):
+            try:
+                if error:
+                    raise ValueError(error)
+                project.image = self.store(data, source=project.image_url)
+                db.session.flush()
+                log(f'imported {project.image_url}')
+            except ValueError as e:
+                log(f'skipped {project.image_url}: {e}')
+
+
+image_processor = ImageProcessor()
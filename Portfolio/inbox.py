@@ -0,0 +1,68 @@
+"""
+Set-based triage of contact messages.
+
+Every operation is a single UPDATE or DELETE over a filter (selected ids,
+a date bound, read state), so marking or purging a few hundred thousand
+rows costs one statement instead of one ORM round trip per message. The
+filters line up with the timestamp and (is_read, timestamp) indexes.
+"""
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import Message
+from counters import adjust_counters
+
+
+def message_filter(ids=None, before=None, older_than_days=None, read=None):
+    """
+    Builds the WHERE conditions for a bulk action. `before` is a datetime,
+    `older_than_days` is relative to now and `read` restricts to read (True)
+    or unread (False) messages. Raises ValueError when nothing narrows the
+    selection, so a bulk action can never hit every message by accident.
+    """
+    conditions = []
+    if ids is not None:
+        conditions.append(Message.id.in_(ids))
+    if before is not None:
+        conditions.append(Message.timestamp < before)
+    if older_than_days is not None:
+        if older_than_days < 1:
+            raise ValueError('the age must be at least one day')
+        conditions.append(Message.timestamp < datetime.utcnow() - timedelta(days=older_than_days))
+    if not conditions:
+        raise ValueError('select messages or give a date')
+    if read is not None:
+        conditions.append(Message.is_read == read)
+    return conditions
+
+
+def mark_read(conditions):
+    """Marks the matching unread messages as read. Returns the number changed; the caller commits."""
+    count = db.session.execute(
+        db.update(Message)
+        .where(*conditions, Message.is_read == False)  # noqa: E712
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    adjust_counters(unread_messages=-count)
+    return count
+
+
+def delete_messages(conditions):
+    """
+    Deletes the matching messages. Returns the number deleted; the caller
+    commits. Their notifications are detached by ON DELETE SET NULL.
+    """
+    # Unread rows go first so the unread counter moves by exactly the rows removed
+    unread = _delete(*conditions, Message.is_read == False)  # noqa: E712
+    other = _delete(*conditions)
+    adjust_counters(messages=-(unread + other), unread_messages=-unread)
+    return unread + other
+
+
+def _delete(*conditions):
+    return db.session.execute(
+        db.delete(Message)
+        .where(*conditions)
+        .execution_options(synchronize_session=False)
+    ).rowcount
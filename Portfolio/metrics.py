@@ -0,0 +1,253 @@
+import bisect
+import threading
+import time
+
+from flask import before_render_template, g, has_app_context, request, template_rendered
+from sqlalchemy import event
+
+# Upper bounds (milliseconds) of the request duration histogram buckets
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RequestTiming:
+    """Timings collected while a single request is handled."""
+
+    __slots__ = ('started', 'queries', 'sql_ms', 'render_ms', 'render_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.render_ms = 0.0
+        self.render_started = []
+
+
+class EndpointStats:
+    """Aggregated timings of one endpoint, with a histogram of request durations."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.sql_ms = 0.0
+        self.render_ms = 0.0
+        self.queries = 0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # The last one is +Inf
+
+    def add(self, total_ms, timing, error):
+        self.count += 1
+        self.errors += error
+        self.total_ms += total_ms
+        self.sql_ms += timing.sql_ms
+        self.render_ms += timing.render_ms
+        self.queries += timing.queries
+        self.max_ms = max(self.max_ms, total_ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, total_ms)] += 1
+
+    def percentile(self, pct):
+        """Upper bound of the bucket that holds the pct-th percentile (max_ms for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        target = pct / 100 * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return min(BUCKETS_MS[index], self.max_ms) if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self):
+        count = self.count or 1
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'mean_ms': self.total_ms / count,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms,
+            'sql_ms': self.sql_ms / count,
+            'queries': self.queries / count,
+            'render_ms': self.render_ms / count,
+        }
+
+
+class RequestMetrics:
+    """
+    Per-request instrumentation: query count, SQL time, template render time
+    and handler time, reported in a Server-Timing header and aggregated in
+    memory per endpoint for /admin/metrics and the Prometheus endpoint.
+
+    The numbers are per process. With METRICS_ENABLED=false no hooks or
+    listeners are installed at all, so requests pay nothing for it.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.server_timing = False
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from extensions import db
+
+        app.extensions['request_metrics'] = self
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.server_timing = app.config.get('METRICS_SERVER_TIMING', True)
+        if not self.enabled:
+            return
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_query)
+                event.listen(engine, 'after_cursor_execute', self._after_query)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        # Registered before the other extensions' hooks so their work is timed too
+        app.before_request_funcs.setdefault(None, []).insert(0, self._start_request)
+        app.after_request(self._finish_request)
+
+    def snapshot(self):
+        """Returns {endpoint: summary dict}, slowest total time first."""
+        with self._lock:
+            summaries = {name: stats.summary() for name, stats in self._endpoints.items()}
+        return dict(sorted(summaries.items(), key=lambda item: -item[1]['mean_ms'] * item[1]['count']))
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+    # --- Hooks ---
+
+    @staticmethod
+    def _current():
+        return g.get('_request_timing') if has_app_context() else None
+
+    @staticmethod
+    def _start_request():
+        g._request_timing = RequestTiming()
+
+    def _finish_request(self, response):
+        timing = g.pop('_request_timing', None)
+        if timing is None:
+            return response
+        total_ms = (time.perf_counter() - timing.started) * 1000
+        endpoint = request.endpoint or 'unmatched'
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.add(total_ms, timing, response.status_code >= 500)
+
+        if self.server_timing:
+            handler_ms = max(0.0, total_ms - timing.sql_ms - timing.render_ms)
+            response.headers['Server-Timing'] = (
+                f'db;dur={timing.sql_ms:.2f};desc="{timing.queries} queries", '
+                f'render;dur={timing.render_ms:.2f}, '
+                f'handler;dur={handler_ms:.2f}, '
+                f'total;dur={total_ms:.2f}'
+            )
+        return response
+
+    def _before_query(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current() is not None:
+            conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+    def _after_query(self, conn, cursor, statement, parameters, context, executemany):
+        timing = self._current()
+        started = conn.info.get('_query_started')
+        if timing is not None and started:
+            timing.queries += 1
+            timing.sql_ms += (time.perf_counter() - started.pop()) * 1000
+
+    def _before_render(self, sender, template, context, **extra):
+        timing = self._current()
+        if timing is not None:
+            timing.render_started.append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        timing = self._current()
+        if timing is not None and timing.render_started:
+            timing.render_ms += (time.perf_counter() - timing.render_started.pop()) * 1000
+
+
+# --- Exposition ---
+
+def process_counters():
+    """Counters kept by the other extensions of this process, as {metric name: value}."""
+    from cache import page_cache
+    from outbox import mail_outbox
+    from snapshot import content_snapshot
+    from static_site import static_site
+    from user_cache import user_cache
+    from visits import visit_recorder
+
+    counters = {
+        'page_cache_hits_total': page_cache.hits,
+        'page_cache_misses_total': page_cache.misses,
+    }
+    for name, value in visit_recorder.stats().items():
+        if isinstance(value, int):
+            counters[f'visits_{name}' if name == 'pending' else f'visits_{name}_total'] = value
+    for name, value in mail_outbox.stats().items():
+        counters[f'outbox_{name}_total'] = value
+    for name, value in user_cache.stats().items():
+        counters[f'user_cache_{name}' if name == 'entries' else f'user_cache_{name}_total'] = value
+    for name, value in content_snapshot.stats().items():
+        counters[f'api_snapshot_{name}_total'] = value
+    for name, value in static_site.stats().items():
+        counters[f'static_pages_{name}_total'] = value
+    return counters
+
+
+def _labels(**labels):
+    pairs = ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                     for key, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def prometheus_text(metrics):
+    """Renders the request histograms and process counters in the Prometheus text format."""
+    with metrics._lock:
+        endpoints = {name: (stats.count, stats.errors, stats.total_ms, stats.sql_ms, stats.render_ms,
+                            stats.queries, list(stats.buckets))
+                     for name, stats in metrics._endpoints.items()}
+
+    lines = [
+        '# HELP portfolio_request_duration_seconds Time to handle a request, by endpoint.',
+        '# TYPE portfolio_request_duration_seconds histogram',
+    ]
+    for name, (count, _, total_ms, _, _, _, buckets) in endpoints.items():
+        cumulative = 0
+        for bound, bucket in zip(BUCKETS_MS + ('+Inf',), buckets):
+            cumulative += bucket
+            le = bound if bound == '+Inf' else f'{bound / 1000:g}'
+            lines.append(f'portfolio_request_duration_seconds_bucket{_labels(endpoint=name, le=le)} {cumulative}')
+        lines.append(f'portfolio_request_duration_seconds_sum{_labels(endpoint=name)} {total_ms / 1000:.6f}')
+        lines.append(f'portfolio_request_duration_seconds_count{_labels(endpoint=name)} {count}')
+
+    per_endpoint = [
+        ('request_errors_total', 'Requests that returned a 5xx status.', lambda e: e[1]),
+        ('request_sql_seconds_total', 'Time spent in SQL queries.', lambda e: f'{e[3] / 1000:.6f}'),
+        ('request_render_seconds_total', 'Time spent rendering templates.', lambda e: f'{e[4] / 1000:.6f}'),
+        ('request_queries_total', 'SQL queries executed.', lambda e: e[5]),
+    ]
+    for metric, help_text, value in per_endpoint:
+        lines.append(f'# HELP portfolio_{metric} {help_text}')
+        lines.append(f'# TYPE portfolio_{metric} counter')
+        for name, entry in endpoints.items():
+            lines.append(f'portfolio_{metric}{_labels(endpoint=name)} {value(entry)}')
+
+    for metric, value in process_counters().items():
+        kind = 'counter' if metric.endswith('_total') else 'gauge'
+        lines.append(f'# TYPE portfolio_{metric} {kind}')
+        lines.append(f'portfolio_{metric} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,165 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name):
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    # Tables that db.create_all() already created are left alone
+    if not _has_table('blog_post'):
+        op.create_table('blog_post',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('author', sa.String(length=100), nullable=False),
+        sa.Column('date_posted', sa.DateTime(), nullable=False),
+        sa.Column('slug', sa.String(length=200), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('slug')
+        )
+    if not _has_table('certification'):
+        op.create_table('certification',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('issuer', sa.String(length=120), nullable=False),
+        sa.Column('date_issued', sa.Date(), nullable=False),
+        sa.Column('credential_link', sa.String(length=200), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not _has_table('content_version'):
+        op.create_table('content_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not _has_table('message'):
+        op.create_table('message',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not _has_table('project'):
+        op.create_table('project',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=120), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('github_link', sa.String(length=200), nullable=True),
+        sa.Column('live_link', sa.String(length=200), nullable=True),
+        sa.Column('image_url', sa.String(length=200), nullable=True),
+        sa.Column('tags', sa.String(length=200), nullable=True),
+        sa.Column('date_created', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not _has_table('rollup_state'):
+        op.create_table('rollup_state',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+    if not _has_table('skill'):
+        op.create_table('skill',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=80), nullable=False),
+        sa.Column('level', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=80), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+    if not _has_table('user'):
+        op.create_table('user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=80), nullable=False),
+        sa.Column('password_hash', sa.String(length=200), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('username')
+        )
+    if not _has_table('user_agent_rollup'):
+        op.create_table('user_agent_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('user_agent', sa.String(length=255), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'user_agent', name='uq_user_agent_rollup_day')
+        )
+    if not _has_table('visit'):
+        op.create_table('visit',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('user_agent', sa.String(length=255), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not _has_table('visit_rollup'):
+        op.create_table('visit_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.DateTime(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('unique_ips', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('period', 'period_start', name='uq_visit_rollup_period')
+        )
+    if not _has_table('outbox_message'):
+        op.create_table('outbox_message',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('message_id', sa.Integer(), nullable=True),
+        sa.Column('sender', sa.String(length=120), nullable=True),
+        sa.Column('recipient', sa.String(length=120), nullable=True),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('claim_token', sa.String(length=32), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['message_id'], ['message.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('outbox_message', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_outbox_message_message_id'), ['message_id'], unique=False)
+            batch_op.create_index('ix_outbox_message_status_next_attempt', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('outbox_message', schema=None) as batch_op:
+        batch_op.drop_index('ix_outbox_message_status_next_attempt')
+        batch_op.drop_index(batch_op.f('ix_outbox_message_message_id'))
+
+    op.drop_table('outbox_message')
+    op.drop_table('visit_rollup')
+    op.drop_table('visit')
+    op.drop_table('user_agent_rollup')
+    op.drop_table('user')
+    op.drop_table('skill')
+    op.drop_table('rollup_state')
+    op.drop_table('project')
+    op.drop_table('message')
+    op.drop_table('content_version')
+    op.drop_table('certification')
+    op.drop_table('blog_post')
@@ -0,0 +1,43 @@
+"""index sort and filter columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:05:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) for every column the routes sort or filter on
+INDEXES = [
+    ('ix_project_date_created', 'project', ['date_created']),
+    ('ix_certification_date_issued', 'certification', ['date_issued']),
+    ('ix_blog_post_date_posted', 'blog_post', ['date_posted']),
+    ('ix_message_timestamp', 'message', ['timestamp']),
+    ('ix_message_is_read_timestamp', 'message', ['is_read', 'timestamp']),
+    ('ix_visit_timestamp', 'visit', ['timestamp']),
+]
+
+
+def _has_index(table, name):
+    return any(index['name'] == name for index in sa.inspect(op.get_bind()).get_indexes(table))
+
+
+def upgrade():
+    # Databases created by db.create_all() after this revision already have them
+    for name, table, columns in INDEXES:
+        if not _has_index(table, name):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,30 @@
+"""dashboard counters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The rows are filled in by `flask portfolio reconcile-counters` or the first dashboard load
+    if not sa.inspect(op.get_bind()).has_table('dashboard_counter'):
+        op.create_table('dashboard_counter',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade():
+    op.drop_table('dashboard_counter')
@@ -0,0 +1,100 @@
+"""normalize project tags
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from slugify import slugify
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+project = sa.table('project', sa.column('id', sa.Integer), sa.column('tags', sa.String))
+# A real Table so that inserted_primary_key works on every backend
+tag = sa.Table('tag', sa.MetaData(),
+               sa.Column('id', sa.Integer, primary_key=True),
+               sa.Column('name', sa.String(50)),
+               sa.Column('slug', sa.String(50)),
+               sa.Column('project_count', sa.Integer))
+project_tag = sa.table('project_tag', sa.column('project_id', sa.Integer), sa.column('tag_id', sa.Integer))
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('tag'):
+        op.create_table('tag',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('slug', sa.String(length=50), nullable=False),
+        sa.Column('project_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('slug')
+        )
+    if not inspector.has_table('project_tag'):
+        op.create_table('project_tag',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['project.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tag.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'tag_id')
+        )
+        op.create_index('ix_project_tag_tag_id', 'project_tag', ['tag_id', 'project_id'], unique=False)
+
+    if 'tags' not in {column['name'] for column in inspector.get_columns('project')}:
+        return
+
+    # Move the comma-separated strings into the new tables
+    conn = op.get_bind()
+    tag_ids = {row.slug: row.id for row in conn.execute(sa.select(tag.c.id, tag.c.slug))}
+    counts = {}
+    links = []
+    for row in conn.execute(sa.select(project.c.id, project.c.tags).where(project.c.tags.isnot(None))):
+        seen = set()
+        for part in row.tags.split(','):
+            name = part.strip()[:50]
+            slug = slugify(name)[:50]
+            if not slug or slug in seen:
+                continue
+            seen.add(slug)
+            if slug not in tag_ids:
+                tag_ids[slug] = conn.execute(
+                    tag.insert().values(name=name, slug=slug, project_count=0)
+                ).inserted_primary_key[0]
+            links.append({'project_id': row.id, 'tag_id': tag_ids[slug]})
+            counts[tag_ids[slug]] = counts.get(tag_ids[slug], 0) + 1
+    if links:
+        op.bulk_insert(project_tag, links)
+    for tag_id, count in counts.items():
+        conn.execute(tag.update().where(tag.c.id == tag_id).values(project_count=count))
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('tags')
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tags', sa.String(length=200), nullable=True))
+
+    conn = op.get_bind()
+    names = {}
+    rows = conn.execute(
+        sa.select(project_tag.c.project_id, tag.c.name)
+        .select_from(project_tag.join(tag, project_tag.c.tag_id == tag.c.id))
+        .order_by(project_tag.c.project_id, tag.c.name)
+    )
+    for row in rows:
+        names.setdefault(row.project_id, []).append(row.name)
+    for project_id, tag_names in names.items():
+        conn.execute(project.update().where(project.c.id == project_id).values(tags=', '.join(tag_names)[:200]))
+
+    op.drop_index('ix_project_tag_tag_id', table_name='project_tag')
+    op.drop_table('project_tag')
+    op.drop_table('tag')
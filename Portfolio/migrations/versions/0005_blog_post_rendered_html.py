@@ -0,0 +1,32 @@
+"""blog post rendered html
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing posts are rendered by `flask portfolio render-posts`; until then they are rendered on each view
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('blog_post')}
+    with op.batch_alter_table('blog_post', schema=None) as batch_op:
+        if 'content_html' not in columns:
+            batch_op.add_column(sa.Column('content_html', sa.Text(), nullable=True))
+        if 'content_hash' not in columns:
+            batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('blog_post', schema=None) as batch_op:
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('content_html')
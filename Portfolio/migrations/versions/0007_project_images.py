@@ -0,0 +1,53 @@
+"""project images
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 11:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing images are imported and resized by `flask portfolio process-images`
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('image'):
+        op.create_table('image',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('sha256', sa.String(length=64), nullable=False),
+            sa.Column('extension', sa.String(length=10), nullable=False),
+            sa.Column('source', sa.String(length=500), nullable=True),
+            sa.Column('width', sa.Integer(), nullable=True),
+            sa.Column('height', sa.Integer(), nullable=True),
+            sa.Column('widths', sa.String(length=100), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('error', sa.String(length=255), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('sha256')
+        )
+        with op.batch_alter_table('image', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_image_source'), ['source'], unique=False)
+
+    columns = {c['name'] for c in inspector.get_columns('project')}
+    if 'image_id' not in columns:
+        with op.batch_alter_table('project', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('image_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_project_image_id', 'image', ['image_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_project_image_id', type_='foreignkey')
+        batch_op.drop_column('image_id')
+    with op.batch_alter_table('image', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_image_source'))
+    op.drop_table('image')
@@ -0,0 +1,43 @@
+"""visit autoincrement
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 13:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Without AUTOINCREMENT SQLite reuses rowids once pruning empties the table, and visits with
+    # ids below the rollup high-water mark would never be rolled up
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    sql = bind.execute(sa.text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'visit'")).scalar()
+    if 'AUTOINCREMENT' not in sql.upper():
+        with op.batch_alter_table('visit', schema=None, recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': True}) as batch_op:
+            pass
+    # The copy only carries the sequence up to the largest remaining id, not up to the mark
+    last_id = bind.execute(sa.text("SELECT last_id FROM rollup_state WHERE name = 'visits'")).scalar() or 0
+    seq = bind.execute(sa.text("SELECT seq FROM sqlite_sequence WHERE name = 'visit'")).scalar()
+    if seq is None:
+        bind.execute(sa.text("INSERT INTO sqlite_sequence (name, seq) VALUES ('visit', :seq)"), {'seq': last_id})
+    elif seq < last_id:
+        bind.execute(sa.text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'visit'"), {'seq': last_id})
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        with op.batch_alter_table('visit', schema=None, recreate='always',
+                                  table_kwargs={'sqlite_autoincrement': False}) as batch_op:
+            pass
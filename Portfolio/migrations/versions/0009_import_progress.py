@@ -0,0 +1,35 @@
+"""import progress
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('import_progress'):
+        op.create_table('import_progress',
+        sa.Column('file_hash', sa.String(length=32), nullable=False),
+        sa.Column('line_number', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('file_hash')
+        )
+    # Checkpoints of interrupted imports used to be kept in rollup_state as 'import:<hash>'
+    op.execute("INSERT INTO import_progress (file_hash, line_number, updated_at) "
+               "SELECT substr(name, 8), last_id, updated_at FROM rollup_state "
+               "WHERE name LIKE 'import:%' AND substr(name, 8) NOT IN (SELECT file_hash FROM import_progress)")
+    op.execute("DELETE FROM rollup_state WHERE name LIKE 'import:%'")
+
+
+def downgrade():
+    op.drop_table('import_progress')
@@ -27,12 +27,59 @@ class Project(db.Model):
     github_link = db.Column(db.String(200), nullable=True)
     live_link = db.Column(db.String(200), nullable=True)
     image_url = db.Column(db.String(200), nullable=True, default='https://placehold.co/600x400/2d3748/ffffff?text=Project')
-    tags = db.Column(db.String(200), nullable=True) # Comma-separated tags
-    date_created = db.Column(db.DateTime, default=datetime.utcnow)
+    date_created = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    image_id = db.Column(db.Integer, db.ForeignKey('image.id', ondelete='SET NULL'), nullable=True) # Uploaded image; image_url is the fallback
+
+    image = db.relationship('Image')
+    tags = db.relationship('Tag', secondary='project_tag', order_by='Tag.name',
+                           backref=db.backref('projects', lazy='dynamic'))
+
+    @property
+    def tag_names(self):
+        """Tags as the comma-separated text the admin form edits"""
+        return ', '.join(tag.name for tag in self.tags)
 
     def __repr__(self):
         return f'<Project {self.title}>'
 
+# Association table; the (tag_id, project_id) index serves the public tag filter
+project_tag = db.Table(
+    'project_tag',
+    db.Column('project_id', db.Integer, db.ForeignKey('project.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('tag_id', db.Integer, db.ForeignKey('tag.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_project_tag_tag_id', 'tag_id', 'project_id'),
+)
+
+class Tag(db.Model):
+    """Project Tag Model"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)
+    slug = db.Column(db.String(50), nullable=False, unique=True)
+    project_count = db.Column(db.Integer, nullable=False, default=0) # Precomputed for the tag cloud
+
+    def __repr__(self):
+        return f'<Tag {self.name}>'
+
+class Image(db.Model):
+    """Stored image, content-addressed under static/media/<sha256> with its resized derivatives"""
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    extension = db.Column(db.String(10), nullable=False) # Of the stored original
+    source = db.Column(db.String(500), nullable=True, index=True) # Upload filename, remote URL or static:<path>
+    width = db.Column(db.Integer, nullable=True)
+    height = db.Column(db.Integer, nullable=True)
+    widths = db.Column(db.String(100), nullable=True) # Comma-separated widths of the generated derivatives
+    status = db.Column(db.String(20), nullable=False, default='pending') # pending, ready or failed
+    error = db.Column(db.String(255), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def derivative_widths(self):
+        return [int(width) for width in self.widths.split(',')] if self.widths else []
+
+    def __repr__(self):
+        return f'<Image {self.sha256[:12]} {self.status}>'
+
 class Skill(db.Model):
     """Skills Model"""
     id = db.Column(db.Integer, primary_key=True)
@@ -48,7 +95,7 @@ class Certification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     issuer = db.Column(db.String(120), nullable=False)
-    date_issued = db.Column(db.Date, nullable=False)
+    date_issued = db.Column(db.Date, nullable=False, index=True)
     credential_link = db.Column(db.String(200), nullable=True)
 
     def __repr__(self):
@@ -60,20 +107,49 @@ class Message(db.Model):
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
     message = db.Column(db.Text, nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     is_read = db.Column(db.Boolean, default=False)
 
+    # Serves the unread count and unread-first listings without touching the table
+    __table_args__ = (db.Index('ix_message_is_read_timestamp', 'is_read', 'timestamp'),)
+
     def __repr__(self):
         return f'<Message from {self.name}>'
 
+class OutboxMessage(db.Model):
+    """Pending email notification, sent by the outbox worker"""
+    id = db.Column(db.Integer, primary_key=True)
+    message_id = db.Column(db.Integer, db.ForeignKey('message.id', ondelete='SET NULL'), nullable=True, index=True)
+    sender = db.Column(db.String(120), nullable=True)
+    recipient = db.Column(db.String(120), nullable=True)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending') # pending, sent or failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(255), nullable=True)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    claim_token = db.Column(db.String(32), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    message = db.relationship('Message', backref=db.backref('notifications', order_by='OutboxMessage.id'))
+
+    __table_args__ = (db.Index('ix_outbox_message_status_next_attempt', 'status', 'next_attempt_at'),)
+
+    def __repr__(self):
+        return f'<OutboxMessage {self.id} {self.status}>'
+
 class BlogPost(db.Model):
     """Blog Post Model"""
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
     author = db.Column(db.String(100), nullable=False, default='Admin')
-    date_posted = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    date_posted = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
     slug = db.Column(db.String(200), unique=True, nullable=False)
+    content_html = db.Column(db.Text, nullable=True) # Sanitized HTML rendered from content at save time
+    content_hash = db.Column(db.String(64), nullable=True) # SHA-256 of the content content_html was rendered from
 
     def __repr__(self):
         return f'<BlogPost {self.title}>'
@@ -83,7 +159,84 @@ class Visit(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     ip_address = db.Column(db.String(45)) # Supports IPv4 and IPv6
     user_agent = db.Column(db.String(255), nullable=True) # <-- ADD THIS LINE
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    # Ids are never reused once pruning empties the table, so none falls below RollupState.last_id
+    __table_args__ = {'sqlite_autoincrement': True}
 
     def __repr__(self):
         return f'<Visit from {self.ip_address} on {self.timestamp}>'
+
+class VisitRollup(db.Model):
+    """Visit counts aggregated per hour or per day"""
+    id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.String(10), nullable=False) # 'hour' or 'day'
+    period_start = db.Column(db.DateTime, nullable=False)
+    hits = db.Column(db.Integer, nullable=False, default=0)
+    unique_ips = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('period', 'period_start', name='uq_visit_rollup_period'),)
+
+    def __repr__(self):
+        return f'<VisitRollup {self.period} {self.period_start}: {self.hits}>'
+
+class UserAgentRollup(db.Model):
+    """Daily visit counts per user agent"""
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    user_agent = db.Column(db.String(255), nullable=False, default='')
+    hits = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.UniqueConstraint('day', 'user_agent', name='uq_user_agent_rollup_day'),)
+
+    def __repr__(self):
+        return f'<UserAgentRollup {self.day}: {self.hits}>'
+
+class RollupState(db.Model):
+    """High-water mark of the raw rows already aggregated"""
+    name = db.Column(db.String(50), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<RollupState {self.name}: {self.last_id}>'
+
+class ImportProgress(db.Model):
+    """Last line of an export file committed by an import, so an interrupted one can resume"""
+    file_hash = db.Column(db.String(32), primary_key=True) # Of the file's header line
+    line_number = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ImportProgress {self.file_hash}: line {self.line_number}>'
+
+class DashboardCounter(db.Model):
+    """Materialized row count shown on the admin dashboard"""
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DashboardCounter {self.name}={self.value}>'
+
+class ContentVersion(db.Model):
+    """Single-row counter bumped whenever public content changes"""
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ContentVersion {self.version}>'
+
+class SearchDocument(db.Model):
+    """Searchable text of a project or blog post, indexed by FTS5 on SQLite"""
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False) # 'project' or 'blog_post'
+    item_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False, default='')
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (db.UniqueConstraint('kind', 'item_id', name='uq_search_document_item'),)
+
+    def __repr__(self):
+        return f'<SearchDocument {self.kind} {self.item_id}>'
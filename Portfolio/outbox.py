@@ -0,0 +1,267 @@
+import atexit
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from runtime import ProcessLocal, start_thread
+
+# SMTP reply codes with which the server closes the session (421: service not available)
+SESSION_CLOSED_CODES = {421}
+
+
+def enqueue_contact_notification(message):
+    """
+    Adds an email notification for a new contact Message to the session.
+    The caller commits, so the notification is stored in the same
+    transaction as the message itself.
+    """
+    from flask import current_app
+    from extensions import db
+    from models import OutboxMessage
+
+    config = current_app.config
+    # A line break in a header would make the email impossible to build
+    name = ' '.join(message.name.splitlines())
+    notification = OutboxMessage(
+        message=message,
+        sender=config.get('MAIL_DEFAULT_SENDER'),
+        recipient=config.get('MAIL_USERNAME'),
+        subject=f'New Portfolio Contact Message from {name}',
+        body=f"Name: {message.name}\nEmail: {message.email}\n\nMessage:\n{message.message}",
+    )
+    db.session.add(notification)
+    return notification
+
+
+class OutboxWorker:
+    """
+    Background sender for the email outbox.
+
+    Due rows are claimed in batches with a short lease (so several workers
+    never send the same row), then delivered over a single SMTP session per
+    drain. Failures are retried with exponential backoff until
+    MAIL_MAX_ATTEMPTS is reached, after which the row is marked 'failed'.
+    """
+
+    def __init__(self, app=None, connection_factory=None):
+        self.app = None
+        self.enabled = True
+        self.connection_factory = connection_factory
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._worker = ProcessLocal(self._start_worker)
+        self.counters = {'sent': 0, 'retried': 0, 'failed': 0, 'sessions': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.get('MAIL_OUTBOX_WORKER', True)
+        self.batch_size = app.config.get('MAIL_OUTBOX_BATCH', 20)
+        self.poll_interval = app.config.get('MAIL_OUTBOX_POLL_INTERVAL', 30.0)
+        self.max_attempts = app.config.get('MAIL_MAX_ATTEMPTS', 5)
+        self.retry_backoff = app.config.get('MAIL_RETRY_BACKOFF', 60)
+        self.lease = timedelta(seconds=app.config.get('MAIL_OUTBOX_LEASE', 300))
+        app.extensions['mail_outbox'] = self
+        if self.enabled:
+            # Picks up notifications left over from a previous run on the first request
+            app.before_request(self._ensure_worker)
+        atexit.register(self.stop)
+
+    def notify(self):
+        """Wakes the sender after new notifications were committed."""
+        if not self.enabled:
+            return
+        self._ensure_worker()
+        self._wake.set()
+
+    def stop(self):
+        """Stops the background sender. Undelivered rows stay in the outbox."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._worker.reset()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=10)
+
+    def stats(self):
+        """Returns a snapshot of the sender counters."""
+        with self._lock:
+            return dict(self.counters)
+
+    def send_pending(self):
+        """Delivers every due notification. Returns the number sent."""
+        import smtplib
+        from extensions import db
+
+        # Errors that reject a single message without breaking the SMTP session
+        rejected = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+        sent = 0
+        with self.app.app_context():
+            server = None
+            try:
+                while True:
+                    batch = self._claim_batch()
+                    if not batch:
+                        break
+                    for index, notification in enumerate(batch):
+                        try:
+                            email = self._build(notification)
+                        except Exception as e:
+                            # Retrying cannot fix a malformed message, and it must not hold up the others
+                            self._mark_failed(notification, e)
+                            db.session.commit()
+                            continue
+                        try:
+                            if server is None:
+                                server = self._connect()
+                            server.send_message(email)
+                        except Exception as e:
+                            if server is not None and isinstance(e, rejected) and not _session_closed(e):
+                                # The server refused this message but the session is still usable
+                                self._schedule_retry(notification, e)
+                            else:
+                                # Connection-level trouble or a server that hung up; back off the rest of the batch as well
+                                server = self._close(server)
+                                for pending in batch[index:]:
+                                    self._schedule_retry(pending, e)
+                                db.session.commit()
+                                return sent
+                        else:
+                            self._mark_sent(notification)
+                            sent += 1
+                        db.session.commit()
+            finally:
+                self._close(server)
+        return sent
+
+    # --- Internal helpers ---
+
+    def _claim_batch(self):
+        from extensions import db
+        from models import OutboxMessage
+
+        now = datetime.utcnow()
+        token = uuid.uuid4().hex
+        due = (
+            db.select(OutboxMessage.id)
+            .where(
+                OutboxMessage.status == 'pending',
+                OutboxMessage.next_attempt_at <= now,
+                db.or_(OutboxMessage.locked_until.is_(None), OutboxMessage.locked_until < now),
+            )
+            .order_by(OutboxMessage.id)
+            .limit(self.batch_size)
+        )
+        # The conditions are repeated so a row claimed by another worker in the meantime is skipped
+        db.session.execute(
+            db.update(OutboxMessage)
+            .where(
+                OutboxMessage.id.in_(due.scalar_subquery()),
+                db.or_(OutboxMessage.locked_until.is_(None), OutboxMessage.locked_until < now),
+            )
+            .values(locked_until=now + self.lease, claim_token=token)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return OutboxMessage.query.filter_by(claim_token=token).order_by(OutboxMessage.id).all()
+
+    def _mark_sent(self, notification):
+        notification.status = 'sent'
+        notification.sent_at = datetime.utcnow()
+        notification.attempts += 1
+        notification.last_error = None
+        notification.locked_until = None
+        notification.claim_token = None
+        self._bump('sent')
+
+    def _mark_failed(self, notification, error):
+        notification.status = 'failed'
+        notification.attempts += 1
+        notification.locked_until = None
+        notification.claim_token = None
+        notification.last_error = str(error)[:255]
+        self._bump('failed')
+        self.app.logger.warning(f"Outbox message {notification.id} cannot be sent: {error}")
+
+    def _schedule_retry(self, notification, error):
+        notification.attempts += 1
+        notification.locked_until = None
+        notification.claim_token = None
+        notification.last_error = str(error)[:255]
+        if notification.attempts >= self.max_attempts:
+            notification.status = 'failed'
+            self._bump('failed')
+        else:
+            delay = self.retry_backoff * 2 ** (notification.attempts - 1)
+            notification.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+            self._bump('retried')
+        self.app.logger.warning(f"Error sending outbox message {notification.id}: {error}")
+
+    def _connect(self):
+        import smtplib
+
+        config = self.app.config
+        if self.connection_factory is not None:
+            server = self.connection_factory()
+        else:
+            server = smtplib.SMTP(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=30)
+            if config.get('MAIL_USE_TLS'):
+                server.starttls()
+            if config.get('MAIL_USERNAME') and config.get('MAIL_PASSWORD'):
+                server.login(config['MAIL_USERNAME'], config['MAIL_PASSWORD'])
+        self._bump('sessions')
+        return server
+
+    @staticmethod
+    def _close(server):
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+        return None
+
+    @staticmethod
+    def _build(notification):
+        from email.message import EmailMessage
+
+        # Unlike the compat32 MIMEText, EmailMessage refuses header values with line breaks
+        msg = EmailMessage()
+        msg.set_content(notification.body)
+        msg['Subject'] = notification.subject
+        msg['From'] = notification.sender
+        msg['To'] = notification.recipient
+        return msg
+
+    def _bump(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _ensure_worker(self):
+        # Returns None, so it can run as a before_request hook
+        self._worker.get()
+
+    def _start_worker(self):
+        self._stop.clear()
+        return start_thread(self._run, 'mail-outbox')
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.send_pending()
+            except Exception as e:
+                self.app.logger.error(f"Outbox worker error: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+def _session_closed(error):
+    """True if the server ended the SMTP session along with refusing the message."""
+    codes = {getattr(error, 'smtp_code', None)}
+    # SMTPRecipientsRefused carries one (code, message) per recipient instead
+    codes.update(code for code, _ in getattr(error, 'recipients', {}).values())
+    return not codes.isdisjoint(SESSION_CLOSED_CODES)
+
+
+mail_outbox = OutboxWorker()
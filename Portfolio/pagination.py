@@ -0,0 +1,108 @@
+import base64
+import json
+from datetime import date, datetime
+
+from flask import current_app, request
+from sqlalchemy import tuple_
+
+
+class KeysetPage:
+    """One page of keyset-paginated results with cursors for its neighbours."""
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode(direction, values):
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    token = base64.urlsafe_b64encode(json.dumps([direction] + payload).encode()).decode()
+    return token.rstrip('=')
+
+
+def _decode(token, keys):
+    """Returns (direction, values) or None if the cursor is malformed."""
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        direction, payload = raw[0], raw[1:]
+        if direction not in ('n', 'p') or len(payload) != len(keys):
+            return None
+        values = []
+        for column, value in zip(keys, payload):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif value is not None:
+                value = python_type(value)
+            values.append(value)
+        return direction, values
+    except (ValueError, TypeError, IndexError, NotImplementedError):
+        return None
+
+
+def page_size():
+    """Page size from the ?per_page= argument, clamped to ADMIN_MAX_PAGE_SIZE."""
+    default = current_app.config.get('ADMIN_PAGE_SIZE', 25)
+    maximum = current_app.config.get('ADMIN_MAX_PAGE_SIZE', 200)
+    per_page = request.args.get('per_page', default, type=int)
+    return max(1, min(per_page, maximum))
+
+
+def keyset_paginate(query, keys, descending=True, cursor=None, per_page=None):
+    """
+    Paginates `query` by seeking past the sort key of the last row seen
+    instead of using OFFSET, so every page costs the same index range scan.
+
+    `keys` are the sort columns, most significant first; the last one must be
+    unique (normally the primary key). Cursors come from ?cursor= by default.
+    """
+    cursor = request.args.get('cursor') if cursor is None else cursor
+    per_page = per_page or page_size()
+    decoded = _decode(cursor, keys) if cursor else None
+    direction, values = decoded if decoded else ('n', None)
+
+    # Going back means walking the index in the opposite direction
+    forward = direction == 'n'
+    walk_descending = descending if forward else not descending
+    if values is not None:
+        row, bound = tuple_(*keys), tuple_(*values)
+        query = query.filter(row < bound if walk_descending else row > bound)
+    order = [key.desc() if walk_descending else key.asc() for key in keys]
+    rows = query.order_by(*order).limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+    if not rows:
+        return KeysetPage([], per_page)
+
+    def key_of(item):
+        return [getattr(item, key.key) for key in keys]
+
+    has_next = has_more if forward else True
+    has_prev = values is not None if forward else has_more
+    return KeysetPage(
+        rows,
+        per_page,
+        next_cursor=_encode('n', key_of(rows[-1])) if has_next else None,
+        prev_cursor=_encode('p', key_of(rows[0])) if has_prev else None,
+    )
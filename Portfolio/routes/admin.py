@@ -1,54 +1,47 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
-from flask_login import login_user, logout_user, login_required
+import hmac
+from datetime import datetime
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, current_app, Response, jsonify
+from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.security import check_password_hash
 from extensions import db
+from cache import bump_content_version
+from analytics import dashboard_stats
+from pagination import keyset_paginate
+from counters import dashboard_counts, track_added, track_deleted
+from tags import release_project_tags
+from blog import render_post, unique_slug
+from search import search_index
+from images import image_processor
+from static_site import static_site
+from metrics import request_metrics, process_counters, prometheus_text
+from inbox import message_filter, mark_read, delete_messages
 from models import Project, Skill, Certification, Message, BlogPost, User
-from slugify import slugify
-from flask_wtf import FlaskForm
-from wtforms import StringField, TextAreaField, SubmitField, DateField, IntegerField, PasswordField
-from wtforms.validators import DataRequired, Email, EqualTo, Length
-
-
-# --- Form Classes ---
-
-class LoginForm(FlaskForm):
-    """Admin Login Form"""
-    username = StringField('Username', validators=[DataRequired()])
-    password = PasswordField('Password', validators=[DataRequired()])
-    submit = SubmitField('Login')
-
-class ProjectForm(FlaskForm):
-    title = StringField('Title', validators=[DataRequired()])
-    description = TextAreaField('Description', validators=[DataRequired()])
-    github_link = StringField('GitHub Link')
-    live_link = StringField('Live Link')
-    image_url = StringField('Image URL')
-    tags = StringField('Tags (comma-separated)')
-    submit = SubmitField('Save Project')
-
-class SkillForm(FlaskForm):
-    name = StringField('Skill Name', validators=[DataRequired()])
-    level = IntegerField('Proficiency Level (1-100)', validators=[DataRequired()])
-    category = StringField('Category', validators=[DataRequired()])
-    submit = SubmitField('Save Skill')
-
-class CertificationForm(FlaskForm):
-    name = StringField('Certification Name', validators=[DataRequired()])
-    issuer = StringField('Issuing Organization', validators=[DataRequired()])
-    date_issued = DateField('Date Issued (YYYY-MM-DD)', validators=[DataRequired()], format='%Y-%m-%d')
-    credential_link = StringField('Credential Link')
-    submit = SubmitField('Save Certification')
-
-class BlogPostForm(FlaskForm):
-    title = StringField('Title', validators=[DataRequired()])
-    content = TextAreaField('Content', validators=[DataRequired()])
-    submit = SubmitField('Save Post')
+from sqlalchemy.orm import selectinload
 
 
 # --- Admin Blueprint ---
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
 
+@admin_bp.before_request
+def check_csrf_token():
+    """Rejects admin POSTs without the session's CSRF token, including the forms that are not FlaskForms."""
+    if request.method == 'POST' and current_app.config.get('WTF_CSRF_ENABLED', True):
+        # Scoped to this blueprint: public pages are cached and frozen, so they cannot carry a per-session token
+        from flask_wtf.csrf import validate_csrf, ValidationError
+        field = current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token')
+        try:
+            validate_csrf(request.form.get(field) or request.headers.get('X-CSRFToken'))
+        except ValidationError as e:
+            abort(400, description=e.args[0])
+
+@admin_bp.app_template_global()
+def csrf_token():
+    """The CSRF token for hand-written admin forms and fetch() calls."""
+    from flask_wtf.csrf import generate_csrf
+    return generate_csrf()
+
+
 # --- Main Admin Routes (Login, Logout, Dashboard) ---
 
 @admin_bp.route('/')
@@ -57,6 +50,8 @@ def index():
 
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
+    from admin_forms import LoginForm
+
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(username=form.username.data).first()
@@ -79,15 +74,36 @@ def logout():
 @admin_bp.route('/dashboard')
 @login_required
 def dashboard():
-    projects_count = Project.query.count()
-    skills_count = Skill.query.count()
-    certifications_count = Certification.query.count()
-    messages_count = Message.query.filter_by(is_read=False).count()
+    # All row counts in one round trip (materialized counters by default)
+    counts = dashboard_counts()
+    # Visit figures come from the rollup tables, never from the raw Visit rows
+    visit_stats = dashboard_stats()
     return render_template('admin/dashboard.html', 
-                           projects_count=projects_count,
-                           skills_count=skills_count,
-                           certifications_count=certifications_count,
-                           messages_count=messages_count)
+                           project_count=counts['projects'],
+                           skill_count=counts['skills'],
+                           certification_count=counts['certifications'],
+                           message_count=counts['messages'],
+                           unread_message_count=counts['unread_messages'],
+                           visit_count=visit_stats['total'],
+                           visit_stats=visit_stats)
+
+@admin_bp.route('/metrics')
+@login_required
+def metrics():
+    return render_template('admin/metrics.html',
+                           enabled=request_metrics.enabled,
+                           endpoints=request_metrics.snapshot(),
+                           since=datetime.fromtimestamp(request_metrics.started_at),
+                           counters=process_counters())
+
+@admin_bp.route('/metrics/prometheus')
+def metrics_prometheus():
+    # Scrapers cannot log in, so a bearer token from METRICS_TOKEN is accepted as well
+    token = current_app.config.get('METRICS_TOKEN')
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+    if not current_user.is_authenticated and not (token and hmac.compare_digest(supplied, token)):
+        abort(401)
+    return Response(prometheus_text(request_metrics), mimetype='text/plain; version=0.0.4')
 
 
 # --- CRUD for Projects ---
@@ -95,20 +111,29 @@ def dashboard():
 @admin_bp.route('/projects')
 @login_required
 def list_projects():
-    projects = Project.query.order_by(Project.date_created.desc()).all()
+    projects = keyset_paginate(Project.query, [Project.date_created, Project.id])
     return render_template('admin/projects.html', projects=projects)
 
 @admin_bp.route('/projects/edit/<int:item_id>', methods=['GET', 'POST'])
 @admin_bp.route('/projects/add', methods=['GET', 'POST'], defaults={'item_id': None})
 @login_required
 def edit_project(item_id):
+    from admin_forms import ProjectForm
+
     project = Project.query.get_or_404(item_id) if item_id else Project()
     form = ProjectForm(obj=project)
     if form.validate_on_submit():
         form.populate_obj(project)
         if not item_id:
             db.session.add(project)
+            track_added(project)
+        search_index.index(project)
+        bump_content_version()
         db.session.commit()
+        static_site.schedule('index')
+        if project.image is not None and project.image.status == 'pending':
+            # Resized copies are made after the commit so the worker can see the row
+            image_processor.submit(project.image.id)
         flash('Project saved successfully!', 'success')
         return redirect(url_for('admin.list_projects'))
     return render_template('admin/edit_project.html', form=form, project=project)
@@ -119,20 +144,25 @@ def edit_project(item_id):
 @admin_bp.route('/skills')
 @login_required
 def list_skills():
-    skills = Skill.query.order_by(Skill.name).all()
+    skills = keyset_paginate(Skill.query, [Skill.name], descending=False)
     return render_template('admin/skills.html', skills=skills)
 
 @admin_bp.route('/skills/edit/<int:item_id>', methods=['GET', 'POST'])
 @admin_bp.route('/skills/add', methods=['GET', 'POST'], defaults={'item_id': None})
 @login_required
 def edit_skill(item_id):
+    from admin_forms import SkillForm
+
     skill = Skill.query.get_or_404(item_id) if item_id else Skill()
     form = SkillForm(obj=skill)
     if form.validate_on_submit():
         form.populate_obj(skill)
         if not item_id:
             db.session.add(skill)
+            track_added(skill)
+        bump_content_version()
         db.session.commit()
+        static_site.schedule('index')
         flash('Skill saved successfully!', 'success')
         return redirect(url_for('admin.list_skills'))
     return render_template('admin/edit_skill.html', form=form, skill=skill)
@@ -143,20 +173,25 @@ def edit_skill(item_id):
 @admin_bp.route('/certifications')
 @login_required
 def list_certifications():
-    certifications = Certification.query.order_by(Certification.date_issued.desc()).all()
+    certifications = keyset_paginate(Certification.query, [Certification.date_issued, Certification.id])
     return render_template('admin/certifications.html', certifications=certifications)
 
 @admin_bp.route('/certifications/edit/<int:item_id>', methods=['GET', 'POST'])
 @admin_bp.route('/certifications/add', methods=['GET', 'POST'], defaults={'item_id': None})
 @login_required
 def edit_certification(item_id):
+    from admin_forms import CertificationForm
+
     certification = Certification.query.get_or_404(item_id) if item_id else Certification()
     form = CertificationForm(obj=certification)
     if form.validate_on_submit():
         form.populate_obj(certification)
         if not item_id:
             db.session.add(certification)
+            track_added(certification)
+        bump_content_version()
         db.session.commit()
+        static_site.schedule('index')
         flash('Certification saved successfully!', 'success')
         return redirect(url_for('admin.list_certifications'))
     return render_template('admin/edit_certification.html', form=form, certification=certification)
@@ -167,21 +202,31 @@ def edit_certification(item_id):
 @admin_bp.route('/blog')
 @login_required
 def list_blog_posts():
-    blog_posts = BlogPost.query.order_by(BlogPost.date_posted.desc()).all()
+    blog_posts = keyset_paginate(BlogPost.query, [BlogPost.date_posted, BlogPost.id])
     return render_template('admin/blog_posts.html', blog_posts=blog_posts)
 
 @admin_bp.route('/blog/edit/<int:item_id>', methods=['GET', 'POST'])
 @admin_bp.route('/blog/add', methods=['GET', 'POST'], defaults={'item_id': None})
 @login_required
 def edit_blog_post(item_id):
+    from admin_forms import BlogPostForm
+
     post = BlogPost.query.get_or_404(item_id) if item_id else BlogPost()
     form = BlogPostForm(obj=post)
     if form.validate_on_submit():
+        old_slug = post.slug
         form.populate_obj(post)
-        post.slug = slugify(post.title)
+        post.slug = unique_slug(post.title, post.id)
+        # Markdown is rendered once here so that reads never parse it
+        render_post(post)
         if not item_id:
             db.session.add(post)
+            track_added(post)
+        search_index.index(post)
+        bump_content_version()
         db.session.commit()
+        # A renamed post moves to a new URL; the old page is removed
+        static_site.schedule('index', f'blog:{post.slug}', *([f'blog:{old_slug}'] if old_slug else []))
         flash('Blog post saved successfully!', 'success')
         return redirect(url_for('admin.list_blog_posts'))
     return render_template('admin/edit_blog_post.html', form=form, post=post)
@@ -206,8 +251,18 @@ def delete_item(item_type, item_id):
 
     model, redirect_url = item_map[item_type]
     item = model.query.get_or_404(item_id)
+    if isinstance(item, Project):
+        release_project_tags(item)
+    if isinstance(item, (Project, BlogPost)):
+        search_index.remove(item)
     db.session.delete(item)
+    track_deleted(item)
+    if model is not Message:
+        bump_content_version()
+    slug = item.slug if isinstance(item, BlogPost) else None
     db.session.commit()
+    if model is not Message:
+        static_site.schedule('index', *([f'blog:{slug}'] if slug else []))
     flash(f'{item_type.capitalize()} deleted successfully!', 'success')
     return redirect(url_for(redirect_url))
 
@@ -217,5 +272,70 @@ def delete_item(item_type, item_id):
 @admin_bp.route('/messages')
 @login_required
 def view_messages():
-    messages = Message.query.order_by(Message.timestamp.desc()).all()
-    return render_template('admin/messages.html', messages=messages)
+    unread_only = request.args.get('unread', type=int) == 1
+    query = Message.query.options(selectinload(Message.notifications))
+    if unread_only:
+        # Served by the (is_read, timestamp) index
+        query = query.filter(Message.is_read == False)  # noqa: E712
+    messages = keyset_paginate(query, [Message.timestamp, Message.id])
+    return render_template('admin/messages.html', messages=messages, unread_only=unread_only)
+
+@admin_bp.route('/messages/<int:id>/read', methods=['POST'])
+@login_required
+def mark_message_read(id):
+    if not db.session.query(Message.id).filter_by(id=id).first():
+        abort(404)
+    count = mark_read(message_filter(ids=[id]))
+    db.session.commit()
+    return _triage_response(count, 'Message marked as read.')
+
+@admin_bp.route('/messages/<int:id>/delete', methods=['POST'])
+@login_required
+def delete_message(id):
+    count = delete_messages(message_filter(ids=[id]))
+    if not count:
+        db.session.rollback()
+        abort(404)
+    db.session.commit()
+    return _triage_response(count, 'Message deleted.')
+
+@admin_bp.route('/messages/bulk', methods=['POST'])
+@login_required
+def bulk_messages():
+    """
+    Marks as read or deletes the selected messages (ids=...), or every message
+    before a date (before=YYYY-MM-DD) or older than N days (older_than_days=N),
+    optionally only read or unread ones (status=read|unread), in one statement.
+    """
+    action = request.form.get('action')
+    if action not in ('read', 'delete'):
+        abort(400)
+    try:
+        before = request.form.get('before')
+        older_than_days = request.form.get('older_than_days')
+        conditions = message_filter(
+            ids=request.form.getlist('ids', type=int) or None,
+            before=datetime.strptime(before, '%Y-%m-%d') if before else None,
+            older_than_days=int(older_than_days) if older_than_days else None,
+            read={'read': True, 'unread': False}.get(request.form.get('status')),
+        )
+    except ValueError as e:
+        return _triage_response(None, f'Nothing to do: {e}.')
+
+    if action == 'read':
+        count = mark_read(conditions)
+        message = f'{count} message(s) marked as read.'
+    else:
+        count = delete_messages(conditions)
+        message = f'{count} message(s) deleted.'
+    db.session.commit()
+    return _triage_response(count, message)
+
+def _triage_response(count, message):
+    """JSON with the affected count for API clients, a flash and redirect for the admin page."""
+    if request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json':
+        if count is None:
+            return jsonify(error=message), 400
+        return jsonify(affected=count)
+    flash(message, 'success' if count is not None else 'danger')
+    return redirect(url_for('admin.view_messages'))
@@ -0,0 +1,95 @@
+from flask import Blueprint, request, current_app, jsonify, url_for
+from snapshot import content_snapshot, RESOURCE_FIELDS
+from cache import get_content_version
+
+
+# --- Read-only JSON API, version 1 ---
+api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+
+@api_bp.after_request
+def allow_cross_origin(response):
+    """Lets the front-ends listed in API_CORS_ORIGINS call the API from the browser."""
+    origins = current_app.config.get('API_CORS_ORIGINS', [])
+    origin = request.headers.get('Origin')
+    if origin and ('*' in origins or origin in origins):
+        response.headers['Access-Control-Allow-Origin'] = '*' if '*' in origins else origin
+        response.headers['Access-Control-Allow-Headers'] = 'If-None-Match, If-Modified-Since'
+        response.headers['Access-Control-Expose-Headers'] = 'ETag'
+        if '*' not in origins:
+            response.vary.add('Origin')
+    return response
+
+
+@api_bp.route('/')
+def index():
+    """Lists the resources with the current content version."""
+    version, last_modified = get_content_version()
+    return jsonify(
+        version=version,
+        updated_at=last_modified.isoformat() if last_modified else None,
+        resources={name: url_for(f'api.{name}') for name in ('projects', 'skills', 'certifications', 'posts')},
+        fields={name: list(fields) for name, fields in RESOURCE_FIELDS.items()},
+    )
+
+
+@api_bp.route('/projects')
+def projects():
+    return respond('projects')
+
+
+@api_bp.route('/skills')
+def skills():
+    """Skills grouped by category, as on the index page."""
+    return respond('skills')
+
+
+@api_bp.route('/certifications')
+def certifications():
+    return respond('certifications')
+
+
+@api_bp.route('/posts')
+def posts():
+    """Blog posts without their content, newest first."""
+    return respond('posts')
+
+
+@api_bp.route('/posts/<slug>')
+def post(slug):
+    """A single blog post with its rendered HTML."""
+    return respond('posts', key=slug)
+
+
+def respond(resource, key=None):
+    """
+    Serves a resource from the content snapshot. ?fields=a,b limits the
+    fields of each item; clients that send the ETag back in If-None-Match
+    get an empty 304 without any serialization.
+    """
+    fields = request.args.get('fields')
+    fields = [name.strip() for name in fields.split(',') if name.strip()] if fields else None
+    try:
+        encoded, last_modified = content_snapshot.representation(resource, fields, key)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    if encoded is None:
+        return jsonify(error='Not found'), 404
+
+    # The gzip variant is a different representation, so it needs its own strong ETag
+    compressed = encoded.gzipped is not None and request.accept_encodings['gzip'] > 0
+    response = current_app.response_class(encoded.gzipped if compressed else encoded.body,
+                                          mimetype='application/json')
+    if compressed:
+        response.content_encoding = 'gzip'
+    response.set_etag(f'{encoded.etag}-gz' if compressed else encoded.etag)
+    response.vary.add('Accept-Encoding')
+    if last_modified is not None:
+        response.last_modified = last_modified
+    max_age = current_app.config.get('API_MAX_AGE', 0)
+    response.cache_control.public = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
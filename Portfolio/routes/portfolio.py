@@ -1,9 +1,16 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
-from models import Project, Skill, Certification, Message, BlogPost, Visit
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
+from flask_login import current_user
+from models import Project, Skill, Certification, Message, BlogPost, Tag, project_tag
 from app import db
-import smtplib
-from email.mime.text import MIMEText
-from config import Config
+from visits import visit_recorder
+from cache import page_cache
+from outbox import enqueue_contact_notification, mail_outbox
+from counters import track_added
+from tags import tag_cloud
+from sqlalchemy.orm import selectinload
+from pagination import keyset_paginate
+from blog import render_post
+from search import search_index
 
 portfolio_bp = Blueprint('portfolio', __name__)
 
@@ -11,16 +18,20 @@ portfolio_bp = Blueprint('portfolio', __name__)
 def track_visit():
     """Simple middleware to track visits."""
     if request.endpoint and 'static' not in request.endpoint:
-        ip = request.remote_addr
-        user_agent = request.headers.get('User-Agent')
-        visit = Visit(ip_address=ip, user_agent=user_agent)
-        db.session.add(visit)
-        db.session.commit()
+        # Buffered by default; see VISIT_TRACKING_MODE in config.py
+        visit_recorder.record(request.remote_addr, request.headers.get('User-Agent'))
 
 @portfolio_bp.route('/')
 def index():
+    """Serves the main portfolio page, from the page cache for anonymous visitors."""
+    # Logged-in admins see extra links in the footer, so they always get a fresh render
+    if current_user.is_authenticated:
+        return render_index()
+    return page_cache.respond('index', render_index)
+
+def render_index():
     """Renders the main portfolio page."""
-    projects = Project.query.order_by(Project.date_created.desc()).all()
+    projects = Project.query.options(selectinload(Project.tags), selectinload(Project.image)).order_by(Project.date_created.desc()).all()
     
     # Group skills by category
     skills_query = Skill.query.all()
@@ -39,6 +50,68 @@ def index():
                            certifications=certifications,
                            blog_posts=blog_posts)
 
+@portfolio_bp.route('/projects')
+def projects():
+    """Lists all projects, or only those with the tag given as ?tag=<slug>."""
+    slug = request.args.get('tag')
+    # Unknown tags 404 before touching the cache, so arbitrary query strings cannot fill it
+    tag = Tag.query.filter_by(slug=slug).first_or_404() if slug else None
+    if current_user.is_authenticated:
+        return render_projects(tag)
+    return page_cache.respond(f'projects:{slug or ""}', lambda: render_projects(tag))
+
+def render_projects(tag=None):
+    """Renders the project list with the tag cloud."""
+    query = Project.query.options(selectinload(Project.tags), selectinload(Project.image))
+    if tag is not None:
+        # Indexed join: tag slug -> project_tag (tag_id, project_id) -> project
+        query = query.join(project_tag).filter(project_tag.c.tag_id == tag.id)
+    projects = query.order_by(Project.date_created.desc()).all()
+    return render_template('projects.html', projects=projects, tag=tag, tags=tag_cloud())
+
+@portfolio_bp.route('/blog')
+def blog():
+    """Paginated archive of blog posts, newest first."""
+    # Only the first page is cached; older pages are addressed by arbitrary cursors
+    if current_user.is_authenticated or request.args.get('cursor'):
+        return render_blog()
+    return page_cache.respond('blog', render_blog)
+
+def render_blog():
+    """Renders one page of the blog archive."""
+    posts = keyset_paginate(BlogPost.query, [BlogPost.date_posted, BlogPost.id],
+                            per_page=current_app.config.get('BLOG_PAGE_SIZE', 10))
+    return render_template('blog.html', posts=posts)
+
+@portfolio_bp.route('/blog/<slug>')
+def blog_post(slug):
+    """Shows a single blog post from its pre-rendered HTML."""
+    post = BlogPost.query.filter_by(slug=slug).first_or_404()
+    if current_user.is_authenticated:
+        return render_blog_post(post)
+    return page_cache.respond(f'blog:{slug}', lambda: render_blog_post(post))
+
+def render_blog_post(post):
+    """Renders a blog post page."""
+    if post.content_html is None:
+        # Saved before Markdown rendering existed; `flask portfolio render-posts` fills these in
+        render_post(post)
+    return render_template('blog_post.html', post=post)
+
+@portfolio_bp.route('/beacon', methods=['POST'])
+def beacon():
+    """Counts a view of a page served from the static export; the visit is recorded by track_visit."""
+    response = current_app.response_class(status=204)
+    response.cache_control.no_store = True
+    return response
+
+@portfolio_bp.route('/search')
+def search():
+    """Full-text search over projects and blog posts."""
+    query = request.args.get('q', '').strip()[:200]
+    results = search_index.search(query) if query else []
+    return render_template('search.html', query=query, results=results)
+
 @portfolio_bp.route('/contact', methods=['POST'])
 def contact():
     """Handles the contact form submission."""
@@ -51,27 +124,16 @@ def contact():
             flash('All fields are required.', 'danger')
             return redirect(url_for('portfolio.index') + '#contact')
 
-        # Save message to database
+        # Save message and its email notification in one transaction
         new_message = Message(name=name, email=email, message=message_body)
         db.session.add(new_message)
+        enqueue_contact_notification(new_message)
+        track_added(new_message)
         db.session.commit()
 
-        # Send email
-        try:
-            msg = MIMEText(f"Name: {name}\nEmail: {email}\n\nMessage:\n{message_body}")
-            msg['Subject'] = f'New Portfolio Contact Message from {name}'
-            msg['From'] = Config.MAIL_DEFAULT_SENDER
-            msg['To'] = Config.MAIL_USERNAME
-
-            with smtplib.SMTP(Config.MAIL_SERVER, Config.MAIL_PORT) as server:
-                server.starttls()
-                server.login(Config.MAIL_USERNAME, Config.MAIL_PASSWORD)
-                server.send_message(msg)
-            
-            flash('Your message has been sent successfully!', 'success')
-        except Exception as e:
-            print(f"Error sending email: {e}")
-            flash('Your message was saved, but there was an error sending the email notification.', 'warning')
+        # The outbox worker delivers the email in the background
+        mail_outbox.notify()
+        flash('Your message has been sent successfully!', 'success')
 
         return redirect(url_for('portfolio.index') + '#contact')
     return redirect(url_for('portfolio.index'))
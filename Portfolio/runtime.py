@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+
+class ProcessLocal:
+    """
+    A background thread or pool created on first use, once per process.
+
+    Threads do not survive fork(), so one started before gunicorn --preload
+    forks its workers would not exist in any of them. get() notices that the
+    value was made in another process and builds a new one, after calling
+    `on_fork` to drop whatever else the child inherited from the parent.
+    """
+
+    def __init__(self, factory, on_fork=None):
+        self.factory = factory
+        self.on_fork = on_fork
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def owned(self):
+        """True if this process created the current value."""
+        return self._value is not None and self._pid == os.getpid()
+
+    def get(self):
+        if self.owned:
+            return self._value
+        with self._lock:
+            if not self.owned:
+                if self._pid is not None and self._pid != os.getpid() and self.on_fork is not None:
+                    self.on_fork()
+                self._pid = os.getpid()
+                self._value = self.factory()
+        return self._value
+
+    def reset(self):
+        """Forgets the value so the next get() makes a new one; returns it if this process owned it."""
+        with self._lock:
+            value = self._value if self.owned else None
+            self._value = None
+        return value
+
+
+def start_thread(target, name):
+    thread = threading.Thread(target=target, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yields a temporary path next to `path` that replaces it when the block
+    succeeds, so readers (nginx, browsers, other workers) only ever see the
+    old file or the complete new one.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix='.tmp-')
+    os.close(fd)
+    try:
+        yield tmp
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_atomic(path, data):
+    """Writes `data` (bytes) to `path` through atomic_path()."""
+    with atomic_path(path) as tmp:
+        with open(tmp, 'wb') as f:
+            f.write(data)
@@ -0,0 +1,77 @@
+import os
+import re
+
+from sqlalchemy.exc import SQLAlchemyError
+
+REVISION_RE = re.compile(r"^revision\s*=\s*['\"]([^'\"]+)['\"]", re.M)
+DOWN_REVISION_RE = re.compile(r"^down_revision\s*=\s*(.+)$", re.M)
+
+
+def migration_heads(directory):
+    """
+    Head revisions of the Flask-Migrate scripts in `directory`/versions.
+    The files are read as text, so web workers do not have to import Alembic.
+    """
+    revisions, parents = set(), set()
+    versions = os.path.join(directory, 'versions')
+    for filename in os.listdir(versions):
+        if not filename.endswith('.py'):
+            continue
+        with open(os.path.join(versions, filename), encoding='utf-8') as f:
+            source = f.read()
+        revision = REVISION_RE.search(source)
+        if revision is None:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = DOWN_REVISION_RE.search(source)
+        if down_revision is not None:
+            # None, a single revision or a tuple of them after a merge
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", down_revision.group(1)))
+    return revisions - parents
+
+
+def database_revisions():
+    """Revisions recorded in the alembic_version table; empty if the database was never migrated."""
+    from extensions import db
+
+    try:
+        rows = db.session.execute(db.text('SELECT version_num FROM alembic_version')).all()
+    except SQLAlchemyError:
+        db.session.rollback()
+        return set()
+    finally:
+        db.session.remove()
+    return {row[0] for row in rows}
+
+
+def prepare_schema(app):
+    """
+    Makes sure the database schema fits the code, according to SCHEMA_MANAGEMENT:
+
+    'create' issues CREATE TABLE for anything missing (db.create_all()),
+    'check' only compares the Flask-Migrate revision of the database with
+    the migration scripts and logs an error when `flask db upgrade` is due,
+    'none' skips both. Returns True unless the check found a mismatch.
+    """
+    from extensions import db
+    from search import search_index
+
+    mode = app.config.get('SCHEMA_MANAGEMENT', 'create')
+    with app.app_context():
+        if mode == 'create':
+            # Create database tables for our models if they don't exist
+            db.create_all()
+            # The FTS5 virtual table is not a model, so create_all() does not cover it
+            search_index.create_schema()
+        elif mode == 'check':
+            directory = app.config.get('MIGRATIONS_DIRECTORY') or os.path.join(app.root_path, 'migrations')
+            expected, current = migration_heads(directory), database_revisions()
+            if current != expected:
+                app.logger.error(
+                    f"Database schema is at {', '.join(sorted(current)) or 'no revision'} but the code "
+                    f"expects {', '.join(sorted(expected))}; run `flask db upgrade`."
+                )
+                return False
+        elif mode != 'none':
+            raise ValueError(f"Unknown SCHEMA_MANAGEMENT: {mode}")
+    return True
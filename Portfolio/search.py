@@ -0,0 +1,252 @@
+import re
+from collections import namedtuple
+from datetime import datetime
+
+from markupsafe import Markup, escape
+from sqlalchemy.exc import OperationalError
+
+# Snippet markers; the text is escaped first and the markers become <mark> tags
+MARK_START, MARK_END = '\x02', '\x03'
+MAX_TERMS = 10
+SNIPPET_CHARS = 160
+
+# External-content FTS5 table over search_document, kept in sync by triggers
+FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5("
+    "title, body, content='search_document', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS search_document_ai AFTER INSERT ON search_document BEGIN "
+    "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_document_ad AFTER DELETE ON search_document BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER IF NOT EXISTS search_document_au AFTER UPDATE ON search_document BEGIN "
+    "INSERT INTO search_fts(search_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+SearchResult = namedtuple('SearchResult', 'kind item title snippet')
+
+
+def search_terms(query):
+    """Splits user input into lower-case word terms, ignoring any query syntax."""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+
+def highlight(text):
+    """Escapes `text` and turns the snippet markers into <mark> tags."""
+    html = str(escape(text or ''))
+    return Markup(html.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>'))
+
+
+def _document_for(item):
+    from models import Project, BlogPost
+
+    if isinstance(item, Project):
+        return 'project', item.title, '\n'.join(filter(None, [item.description, item.tag_names]))
+    if isinstance(item, BlogPost):
+        return 'blog_post', item.title, item.content or ''
+    raise TypeError(f'{type(item).__name__} is not searchable')
+
+
+class SearchIndex:
+    """
+    Full-text search over projects and blog posts.
+
+    Admin routes call `index()`/`remove()` before committing, so the search
+    documents change in the same transaction as the content. On SQLite an
+    FTS5 table provides ranked matching and snippets; other databases (or a
+    SQLite build without FTS5) fall back to LIKE matching over the same rows.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.mode = 'auto'
+        self.backend = None  # 'fts5' or 'like', resolved on first use
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.mode = app.config.get('SEARCH_BACKEND', 'auto')
+        if self.mode not in ('auto', 'fts5', 'like'):
+            raise ValueError(f"Unknown SEARCH_BACKEND: {self.mode}")
+        self.limit = app.config.get('SEARCH_RESULTS_LIMIT', 20)
+        self.backend = None
+        app.extensions['search_index'] = self
+
+    def create_schema(self):
+        """Creates the FTS5 table and triggers if this database supports them."""
+        from extensions import db
+
+        if self.mode == 'like' or db.engine.dialect.name != 'sqlite':
+            self.backend = 'like'
+            return
+        try:
+            with db.engine.begin() as conn:
+                for statement in FTS_SCHEMA:
+                    conn.exec_driver_sql(statement)
+            self.backend = 'fts5'
+        except OperationalError as e:
+            if self.mode == 'fts5':
+                raise
+            self.app.logger.warning(f"FTS5 unavailable, search falls back to LIKE: {e}")
+            self.backend = 'like'
+
+    def _resolve_backend(self):
+        from extensions import db
+
+        if self.backend is None:
+            if self.mode == 'like' or db.engine.dialect.name != 'sqlite':
+                self.backend = 'like'
+            else:
+                exists = db.session.execute(db.text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_fts'")).first()
+                self.backend = 'fts5' if exists else 'like'
+        return self.backend
+
+    # --- Keeping the index in sync ---
+
+    def index(self, item):
+        """Adds or refreshes the search document of a project or blog post."""
+        from extensions import db
+        from models import SearchDocument
+
+        if item.id is None:
+            db.session.flush()
+        kind, title, body = _document_for(item)
+        document = SearchDocument.query.filter_by(kind=kind, item_id=item.id).first()
+        if document is None:
+            db.session.add(SearchDocument(kind=kind, item_id=item.id, title=title, body=body))
+        elif (document.title, document.body) != (title, body):
+            document.title, document.body = title, body
+            document.updated_at = datetime.utcnow()
+
+    def remove(self, item):
+        """Drops the search document of a project or blog post."""
+        from extensions import db
+        from models import SearchDocument
+
+        kind = _document_for(item)[0]
+        db.session.execute(
+            db.delete(SearchDocument)
+            .where(SearchDocument.kind == kind, SearchDocument.item_id == item.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    def rebuild(self, batch_size=500):
+        """Regenerates every search document from the content tables. Returns the count."""
+        from extensions import db
+        from models import Project, BlogPost, SearchDocument
+        from sqlalchemy.orm import selectinload
+
+        db.session.execute(db.delete(SearchDocument))
+        total = 0
+        for model, options in ((Project, [selectinload(Project.tags)]), (BlogPost, [])):
+            last_id = 0
+            while True:
+                items = (model.query.options(*options)
+                         .filter(model.id > last_id)
+                         .order_by(model.id)
+                         .limit(batch_size)
+                         .all())
+                if not items:
+                    break
+                rows = []
+                for item in items:
+                    kind, title, body = _document_for(item)
+                    rows.append({'kind': kind, 'item_id': item.id, 'title': title, 'body': body,
+                                 'updated_at': datetime.utcnow()})
+                db.session.execute(db.insert(SearchDocument), rows)
+                total += len(rows)
+                last_id = items[-1].id
+                db.session.commit()
+                db.session.expunge_all()
+
+        if self._resolve_backend() == 'fts5':
+            # Also repairs an index that drifted from search_document
+            db.session.execute(db.text("INSERT INTO search_fts(search_fts) VALUES ('rebuild')"))
+            db.session.execute(db.text("INSERT INTO search_fts(search_fts) VALUES ('optimize')"))
+        db.session.commit()
+        return total
+
+    # --- Querying ---
+
+    def search(self, query, limit=None):
+        """Returns up to `limit` SearchResults for `query`, best match first."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+        limit = limit or self.limit
+        if self._resolve_backend() == 'fts5':
+            hits = self._search_fts(terms, limit)
+        else:
+            hits = self._search_like(terms, limit)
+        return self._load_items(hits)
+
+    def _search_fts(self, terms, limit):
+        from extensions import db
+
+        # Every term must match; the last one as a prefix so partial words find results
+        match = ' '.join(f'"{term}"' for term in terms) + '*'
+        # ORDER BY rank lets FTS5 sort internally, so snippet() only runs for the
+        # rows returned instead of for every match; title hits weigh 10x
+        rows = db.session.execute(db.text(
+            "SELECT d.kind, d.item_id, d.title, "
+            "snippet(search_fts, 1, :start, :end, '…', 24) AS snippet "
+            "FROM search_fts JOIN search_document d ON d.id = search_fts.rowid "
+            "WHERE search_fts MATCH :match AND rank MATCH 'bm25(10.0, 1.0)' "
+            "ORDER BY rank "
+            "LIMIT :limit"
+        ), {'match': match, 'start': MARK_START, 'end': MARK_END, 'limit': limit})
+        return [(row.kind, row.item_id, row.title, row.snippet) for row in rows]
+
+    def _search_like(self, terms, limit):
+        from extensions import db
+        from models import SearchDocument
+
+        # Terms are word characters only, so '_' is the one LIKE wildcard to escape
+        patterns = ['%' + term.replace('_', '\\_') + '%' for term in terms]
+        conditions = [db.or_(SearchDocument.title.ilike(pattern, escape='\\'),
+                             SearchDocument.body.ilike(pattern, escape='\\'))
+                      for pattern in patterns]
+        title_match = db.case((SearchDocument.title.ilike(patterns[0], escape='\\'), 1), else_=0)
+        documents = (SearchDocument.query
+                     .filter(*conditions)
+                     .order_by(title_match.desc(), SearchDocument.updated_at.desc())
+                     .limit(limit)
+                     .all())
+        return [(d.kind, d.item_id, d.title, self._make_snippet(d.body, terms)) for d in documents]
+
+    @staticmethod
+    def _make_snippet(body, terms):
+        body = ' '.join((body or '').split())
+        lowered = body.lower()
+        positions = [lowered.find(term) for term in terms if term in lowered]
+        start = max(0, min(positions) - SNIPPET_CHARS // 3) if positions else 0
+        window = body[start:start + SNIPPET_CHARS]
+        pattern = re.compile('|'.join(re.escape(term) for term in terms), re.IGNORECASE)
+        window = pattern.sub(lambda m: f'{MARK_START}{m.group(0)}{MARK_END}', window)
+        return ('…' if start else '') + window + ('…' if start + SNIPPET_CHARS < len(body) else '')
+
+    @staticmethod
+    def _load_items(hits):
+        from models import Project, BlogPost
+
+        models = {'project': Project, 'blog_post': BlogPost}
+        ids = {}
+        for kind, item_id, _, _ in hits:
+            ids.setdefault(kind, []).append(item_id)
+        items = {}
+        for kind, item_ids in ids.items():
+            model = models[kind]
+            for item in model.query.filter(model.id.in_(item_ids)):
+                items[(kind, item.id)] = item
+
+        results = []
+        for kind, item_id, title, snippet in hits:
+            item = items.get((kind, item_id))
+            if item is not None:
+                results.append(SearchResult(kind, item, title, highlight(snippet)))
+        return results
+
+
+search_index = SearchIndex()
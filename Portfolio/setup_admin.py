@@ -1,7 +1,33 @@
 import getpass
+import sys
 from app import create_app, db
 from models import User
 
+def reset_password():
+    """
+    Sets a new password for an existing admin user. The commit also tells
+    the user cache of running servers to drop the old identity.
+    """
+    app = create_app()
+    with app.app_context():
+        print("--- Reset Admin Password ---")
+
+        username = input("Enter admin username: ")
+        user = User.query.filter_by(username=username).first()
+        if user is None:
+            print(f"No admin user named '{username}'. Aborting.")
+            return
+
+        password = getpass.getpass("Enter new password: ")
+        confirm_password = getpass.getpass("Confirm new password: ")
+        if not password or password != confirm_password:
+            print("Passwords are empty or do not match. Aborting.")
+            return
+
+        user.set_password(password)
+        db.session.commit()
+        print(f"Password of '{username}' updated.")
+
 def setup_admin():
     """
     Creates the first admin user for the application.
@@ -14,6 +40,7 @@ def setup_admin():
         # Check if an admin user already exists
         if User.query.first():
             print("An admin user already exists. Skipping.")
+            print("Run 'python setup_admin.py --reset-password' to change a password.")
             return
 
         # Prompt for username and password
@@ -41,4 +68,7 @@ def setup_admin():
         print("You can now run the main application using 'python app.py'")
 
 if __name__ == '__main__':
-    setup_admin()
+    if '--reset-password' in sys.argv[1:]:
+        reset_password()
+    else:
+        setup_admin()
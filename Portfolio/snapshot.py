@@ -0,0 +1,182 @@
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from flask import url_for
+
+# Fields each resource exposes; ?fields= may select any subset of them
+RESOURCE_FIELDS = {
+    'projects': ('id', 'title', 'description', 'github_link', 'live_link', 'image', 'tags', 'date_created'),
+    'skills': ('id', 'name', 'level', 'category'),
+    'certifications': ('id', 'name', 'issuer', 'date_issued', 'credential_link'),
+    'posts': ('id', 'title', 'slug', 'author', 'date_posted', 'url'),
+    'post': ('id', 'title', 'slug', 'author', 'date_posted', 'url', 'content_html'),
+}
+
+
+class Representation:
+    """One encoded API response: the JSON body, its gzip variant (if worth it) and the body's hash."""
+
+    __slots__ = ('body', 'gzipped', 'etag')
+
+    def __init__(self, body, gzip_min_size):
+        self.body = body
+        # mtime=0 keeps the compressed bytes, and so their ETag, identical in every worker
+        self.gzipped = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= gzip_min_size else None
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+
+
+class ContentSnapshot:
+    """
+    Serialized copy of the public content served by the /api/v1 blueprint.
+
+    The snapshot is keyed by the content version that admin routes bump in
+    the same transaction as their change, so it is rebuilt once per worker
+    after each save and never otherwise. Encoded responses (per resource and
+    field selection) are kept in a small LRU beside it; their ETags hash the
+    body, so every worker hands out the same tag for the same content.
+    """
+
+    def __init__(self, app=None):
+        self.max_entries = 64
+        self.gzip_min_size = 500
+        self.builds = 0
+        self.hits = 0
+        self.misses = 0
+        self._snapshot = (None, None, None)  # (version, last_modified, data), replaced as a whole
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('API_CACHE_MAX_ENTRIES', 64)
+        self.gzip_min_size = app.config.get('API_GZIP_MIN_SIZE', 500)
+        app.extensions['content_snapshot'] = self
+
+    def current(self):
+        """Returns (version, last_modified, data), rebuilding the snapshot if the content changed."""
+        from cache import get_content_version
+
+        version, last_modified = get_content_version()
+        if version != self._snapshot[0]:
+            with self._lock:
+                if version != self._snapshot[0]:
+                    self._snapshot = (version, last_modified, self._build())
+                    self._responses.clear()
+                    self.builds += 1
+        return self._snapshot
+
+    def representation(self, resource, fields=None, key=None):
+        """
+        The encoded response for `resource` (or for the item `key` of it),
+        limited to `fields`. Returns (representation, last_modified), or
+        (None, last_modified) if `key` is not in the snapshot. Raises
+        ValueError for fields the resource does not have.
+        """
+        allowed = RESOURCE_FIELDS.get('post' if key else resource, ())
+        if fields is not None:
+            unknown = sorted(set(fields) - set(allowed))
+            if unknown:
+                raise ValueError(f"Unknown field(s) for {resource}: {', '.join(unknown)}")
+            # Keep the resource's own order so that ?fields=b,a and ?fields=a,b share an entry
+            fields = tuple(name for name in allowed if name in fields)
+
+        version, last_modified, data = self.current()
+        cache_key = (version, resource, key, fields)
+        with self._lock:
+            cached = self._responses.get(cache_key)
+            if cached is not None:
+                self._responses.move_to_end(cache_key)
+                self.hits += 1
+                return cached, last_modified
+
+        if key is not None:
+            value = data['posts_by_slug'].get(key)
+            if value is None:
+                return None, last_modified
+        else:
+            value = data[resource]
+        if fields is not None:
+            if resource == 'skills':
+                value = {category: _select(items, fields) for category, items in value.items()}
+            elif key is None:
+                value = _select(value, fields)
+            else:
+                value = {name: value[name] for name in fields}
+        body = json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        encoded = Representation(body, self.gzip_min_size)
+
+        with self._lock:
+            self.misses += 1
+            if self._snapshot[0] == version:
+                self._responses[cache_key] = encoded
+                while len(self._responses) > self.max_entries:
+                    self._responses.popitem(last=False)
+        return encoded, last_modified
+
+    def stats(self):
+        return {'builds': self.builds, 'hits': self.hits, 'misses': self.misses}
+
+    # --- Internal helpers ---
+
+    @staticmethod
+    def _build():
+        from sqlalchemy.orm import selectinload
+        from blog import render_post
+        from images import image_processor
+        from models import Project, Skill, Certification, BlogPost
+
+        projects = Project.query.options(selectinload(Project.tags), selectinload(Project.image)) \
+            .order_by(Project.date_created.desc()).all()
+
+        # Grouped by category like the skills section of the index page
+        skills = {}
+        for skill in Skill.query.all():
+            skills.setdefault(skill.category, []).append(
+                {'id': skill.id, 'name': skill.name, 'level': skill.level, 'category': skill.category})
+
+        certifications = Certification.query.order_by(Certification.date_issued.desc()).all()
+        posts = BlogPost.query.order_by(BlogPost.date_posted.desc()).all()
+
+        posts_by_slug = {}
+        for post in posts:
+            if post.content_html is None:
+                # Saved before Markdown rendering existed; rendered here without being committed
+                render_post(post)
+            posts_by_slug[post.slug] = {
+                'id': post.id, 'title': post.title, 'slug': post.slug, 'author': post.author,
+                'date_posted': _isoformat(post.date_posted),
+                'url': url_for('portfolio.blog_post', slug=post.slug),
+                'content_html': post.content_html,
+            }
+
+        return {
+            'projects': [{
+                'id': project.id, 'title': project.title, 'description': project.description,
+                'github_link': project.github_link, 'live_link': project.live_link,
+                'image': image_processor.image_src(project.image) if project.image else project.image_url,
+                'tags': [{'name': tag.name, 'slug': tag.slug} for tag in project.tags],
+                'date_created': _isoformat(project.date_created),
+            } for project in projects],
+            'skills': skills,
+            'certifications': [{
+                'id': cert.id, 'name': cert.name, 'issuer': cert.issuer,
+                'date_issued': _isoformat(cert.date_issued), 'credential_link': cert.credential_link,
+            } for cert in certifications],
+            'posts': [{name: post[name] for name in RESOURCE_FIELDS['posts']} for post in posts_by_slug.values()],
+            'posts_by_slug': posts_by_slug,
+        }
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _select(items, fields):
+    return [{name: item[name] for name in fields} for item in items]
+
+
+content_snapshot = ContentSnapshot()
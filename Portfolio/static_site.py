@@ -0,0 +1,170 @@
+import atexit
+import gzip
+import os
+import threading
+
+from flask import g
+
+from runtime import ProcessLocal, start_thread, write_atomic
+
+INDEX = 'index'
+
+
+def page_file(page):
+    """Output file of a page name ('index' or 'blog:<slug>'), relative to the output directory."""
+    if page == INDEX:
+        return 'index.html'
+    slug = page.split(':', 1)[1]
+    if not slug or '/' in slug or '\\' in slug or slug.startswith('.'):
+        raise ValueError(f'Slug cannot be exported as a file: {slug!r}')
+    return os.path.join('blog', f'{slug}.html')
+
+
+class StaticSite:
+    """
+    Static copy of the public pages for a front server such as nginx.
+
+    `flask portfolio freeze` renders the index page and every blog post into
+    the output directory, each with a precompressed .gz twin. Once that
+    directory exists, admin saves and deletes schedule the pages they
+    affect and a background thread renders only those, replacing each file
+    atomically so that nginx never serves a half-written page. Frozen pages
+    record visits through the /beacon endpoint instead of track_visit.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.output_dir = None
+        self.enabled = True
+        self._pending = set()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._worker = ProcessLocal(self._start_worker)
+        self.counters = {'written': 0, 'removed': 0, 'errors': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.output_dir = app.config.get('STATIC_EXPORT_DIR') or os.path.join(app.instance_path, 'site')
+        self.enabled = app.config.get('STATIC_EXPORT_REGENERATE', True)
+        app.extensions['static_site'] = self
+        atexit.register(self.stop)
+
+    def freeze(self, output_dir=None, log=print):
+        """Renders every public page into `output_dir` and drops pages of deleted posts. Returns the pages written."""
+        from models import BlogPost
+
+        output_dir = output_dir or self.output_dir
+        pages = [INDEX] + [f'blog:{slug}' for slug, in BlogPost.query.with_entities(BlogPost.slug)]
+        written = set()
+        for page in pages:
+            try:
+                self._write(output_dir, page, self._render(page))
+            except ValueError as e:
+                log(f'Skipped {page}: {e}')
+                continue
+            written.add(page_file(page))
+
+        blog_dir = os.path.join(output_dir, 'blog')
+        for filename in os.listdir(blog_dir) if os.path.isdir(blog_dir) else []:
+            stale = os.path.join('blog', filename)
+            if filename.endswith('.html') and stale not in written:
+                self._remove(output_dir, stale)
+                log(f'Removed {stale}')
+        return len(written)
+
+    def schedule(self, *pages):
+        """Queues pages for regeneration; call after the change was committed."""
+        if not self.enabled or not os.path.isdir(self.output_dir):
+            # Nothing was frozen yet, so there are no files to keep up to date
+            return
+        with self._lock:
+            self._pending.update(pages)
+        self._worker.get()
+        self._wake.set()
+
+    def regenerate_pending(self):
+        """Renders (or removes, for deleted posts) every queued page. Returns the number handled."""
+        with self._lock:
+            pages, self._pending = self._pending, set()
+        for page in sorted(pages):
+            try:
+                html = self._render(page)
+                if html is None:
+                    self._remove(self.output_dir, page_file(page))
+                else:
+                    self._write(self.output_dir, page, html)
+            except Exception as e:
+                self._bump('errors')
+                self.app.logger.error(f'Could not regenerate static page {page}: {e}')
+        return len(pages)
+
+    def stop(self):
+        """Stops the background thread after it regenerated what was queued."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._worker.reset()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=30)
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
+
+    # --- Internal helpers ---
+
+    def _render(self, page):
+        """HTML of `page` as an anonymous visitor sees it, or None if its post no longer exists."""
+        from models import BlogPost
+        from routes.portfolio import render_index, render_blog_post
+
+        slug = None if page == INDEX else page.split(':', 1)[1]
+        path = '/' if slug is None else f'/blog/{slug}'
+        with self.app.test_request_context(path):
+            # Makes layout.html add the visit beacon
+            g.static_export = True
+            if slug is None:
+                return render_index()
+            post = BlogPost.query.filter_by(slug=slug).first()
+            return render_blog_post(post) if post is not None else None
+
+    def _write(self, output_dir, page, html):
+        path = os.path.join(output_dir, page_file(page))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content = html.encode('utf-8')
+        # Served to most clients by nginx's gzip_static, so it must be replaced along with the page
+        write_atomic(path + '.gz', gzip.compress(content, compresslevel=9, mtime=0))
+        write_atomic(path, content)
+        self._bump('written')
+
+    def _remove(self, output_dir, filename):
+        for suffix in ('', '.gz'):
+            try:
+                os.remove(os.path.join(output_dir, filename + suffix))
+            except FileNotFoundError:
+                pass
+        self._bump('removed')
+
+    def _bump(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _start_worker(self):
+        self._stop.clear()
+        return start_thread(self._run, 'static-site')
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.regenerate_pending()
+            except Exception as e:
+                self.app.logger.error(f'Static site worker error: {e}')
+            if self._stop.is_set():
+                break
+
+
+static_site = StaticSite()
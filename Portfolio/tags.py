@@ -0,0 +1,69 @@
+from extensions import db
+from models import Tag
+
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(text):
+    """Splits comma-separated input into (name, slug) pairs, dropping blanks and duplicates."""
+    from slugify import slugify
+
+    seen = set()
+    tags = []
+    for part in (text or '').split(','):
+        name = part.strip()[:MAX_TAG_LENGTH]
+        slug = slugify(name)[:MAX_TAG_LENGTH]
+        if not slug or slug in seen:
+            continue
+        seen.add(slug)
+        tags.append((name, slug))
+    return tags
+
+
+def set_project_tags(project, text):
+    """
+    Replaces a project's tags with the comma-separated `text`, creating
+    missing Tag rows and keeping Tag.project_count in step. The caller commits.
+    """
+    wanted = parse_tags(text)
+    current = {tag.slug: tag for tag in project.tags}
+    slugs = [slug for _, slug in wanted]
+    existing = {tag.slug: tag for tag in Tag.query.filter(Tag.slug.in_(slugs))} if slugs else {}
+
+    tags = []
+    for name, slug in wanted:
+        tag = current.get(slug) or existing.get(slug)
+        if tag is None:
+            tag = Tag(name=name, slug=slug, project_count=1)
+            db.session.add(tag)
+        elif slug not in current:
+            tag.project_count = Tag.project_count + 1
+        tags.append(tag)
+
+    for slug, tag in current.items():
+        if slug not in slugs:
+            tag.project_count = Tag.project_count - 1
+    project.tags = tags
+
+
+def release_project_tags(project):
+    """Decrements the counts of a project's tags before it is deleted."""
+    for tag in project.tags:
+        tag.project_count = Tag.project_count - 1
+
+
+def tag_cloud():
+    """Tags in use, with their precomputed project counts."""
+    return Tag.query.filter(Tag.project_count > 0).order_by(Tag.name).all()
+
+
+def reconcile_tag_counts():
+    """Recomputes every Tag.project_count from the association table."""
+    from models import project_tag
+
+    counts = (db.select(db.func.count())
+              .select_from(project_tag)
+              .where(project_tag.c.tag_id == Tag.id)
+              .scalar_subquery())
+    db.session.execute(db.update(Tag).values(project_count=counts))
+    db.session.commit()
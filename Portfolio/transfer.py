@@ -0,0 +1,325 @@
+"""
+NDJSON export and import of the portfolio content.
+
+The file starts with a header line followed by one JSON object per row,
+table by table. Rows carry their natural key instead of the database id,
+so a file can be loaded into any environment and imported more than once:
+
+    project        title
+    skill          name
+    certification  name, issuer
+    blog_post      slug
+    message        email, timestamp
+    visit          (none, always appended)
+
+Admin users, uploaded images, the email outbox and derived tables
+(rollups, counters, the search index, rendered blog HTML) are not exported;
+the import rebuilds the derived data at the end.
+"""
+import gzip
+import hashlib
+import json
+import sys
+import time
+from datetime import date, datetime
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from extensions import db
+from models import Project, Skill, Certification, BlogPost, Message, Visit, Tag, ImportProgress, project_tag
+
+FORMAT = 1
+
+
+class Table:
+    """How one model is written to and read from the NDJSON file."""
+
+    def __init__(self, name, model, fields, keys=()):
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.keys = keys
+        self.columns = {field: getattr(model, field) for field in fields}
+
+
+TABLES = [
+    Table('project', Project, ['title', 'description', 'github_link', 'live_link', 'image_url', 'date_created'],
+          keys=('title',)),
+    Table('skill', Skill, ['name', 'level', 'category'], keys=('name',)),
+    Table('certification', Certification, ['name', 'issuer', 'date_issued', 'credential_link'],
+          keys=('name', 'issuer')),
+    Table('blog_post', BlogPost, ['title', 'content', 'author', 'date_posted', 'slug'], keys=('slug',)),
+    Table('message', Message, ['name', 'email', 'message', 'timestamp', 'is_read'], keys=('email', 'timestamp')),
+    Table('visit', Visit, ['ip_address', 'user_agent', 'timestamp']),
+]
+TABLES_BY_NAME = {table.name: table for table in TABLES}
+
+
+class TransferError(ValueError):
+    """The import file cannot be used."""
+
+
+def _open(path, mode):
+    if path == '-':
+        return sys.stdout if mode == 'w' else sys.stdin
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _to_json(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _from_json(column, value):
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+# --- Export ---
+
+def export_content(path, tables=None, batch_size=1000, log=None):
+    """
+    Streams the chosen tables (all by default) to `path` ('-' for stdout,
+    gzip for *.gz). Rows are read in primary-key batches, so memory use does
+    not grow with the table size. Returns {table name: rows written}.
+    """
+    chosen = [table for table in TABLES if tables is None or table.name in tables]
+    counts = {}
+    out = _open(path, 'w')
+    try:
+        out.write(json.dumps({'type': 'header', 'format': FORMAT,
+                              'exported_at': datetime.utcnow().isoformat(),
+                              'tables': [table.name for table in chosen]}) + '\n')
+        for table in chosen:
+            counts[table.name] = 0
+            started = time.monotonic()
+            for rows in _batches(table, batch_size):
+                tags = _project_tags([row.id for row in rows]) if table.model is Project else None
+                for row in rows:
+                    record = {'type': table.name}
+                    record.update((field, _to_json(getattr(row, field))) for field in table.fields)
+                    if tags is not None:
+                        record['tags'] = tags.get(row.id, [])
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                counts[table.name] += len(rows)
+                if log:
+                    log(f'{table.name}: {counts[table.name]} row(s) exported '
+                        f'({counts[table.name] / max(time.monotonic() - started, 1e-6):.0f}/s)')
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        else:
+            out.flush()
+    return counts
+
+
+def _batches(table, batch_size):
+    model = table.model
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            db.select(model.id, *table.columns.values())
+            .where(model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _project_tags(project_ids):
+    tags = {}
+    rows = db.session.execute(
+        db.select(project_tag.c.project_id, Tag.name)
+        .join(Tag, Tag.id == project_tag.c.tag_id)
+        .where(project_tag.c.project_id.in_(project_ids))
+        .order_by(Tag.name)
+    )
+    for project_id, name in rows:
+        tags.setdefault(project_id, []).append(name)
+    return tags
+
+
+# --- Import ---
+
+def import_content(path, batch_size=500, resume=False, log=None):
+    """
+    Loads an export file ('-' for stdin), upserting rows by their natural
+    key in batches of `batch_size`. Each batch commits together with the
+    number of the last line it covered, so an interrupted import of the
+    same file continues after the last committed batch when run again with
+    `resume`. Returns {table name: rows imported}.
+    """
+    counts = {}
+    batch, batch_table = [], None
+    line_number = start_line = 0
+    file_hash = None
+    started = time.monotonic()
+    source = _open(path, 'r')
+    try:
+        for line_number, line in enumerate(source, start=1):
+            if line_number == 1:
+                file_hash = _check_header(line)
+                start_line = _read_progress(file_hash) if resume else 0
+                if start_line and log:
+                    log(f'Resuming after line {start_line}.')
+                continue
+            if line_number <= start_line or not line.strip():
+                continue
+            table, row = _parse(line, line_number)
+            if batch and (table is not batch_table or len(batch) >= batch_size):
+                _flush(batch_table, batch, file_hash, line_number - 1, counts, started, log)
+                batch = []
+            batch_table = table
+            batch.append(row)
+        if batch:
+            _flush(batch_table, batch, file_hash, line_number, counts, started, log)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    if line_number == 0:
+        raise TransferError('the file is empty')
+    _rebuild_derived(file_hash, log)
+    return counts
+
+
+def _check_header(line):
+    try:
+        header = json.loads(line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get('type') != 'header':
+        raise TransferError('line 1: not a portfolio export (missing header)')
+    if header.get('format') != FORMAT:
+        raise TransferError(f"line 1: unsupported export format {header.get('format')}")
+    # The header holds the export time, so its hash identifies the file for resuming
+    return hashlib.sha1(line.strip().encode()).hexdigest()[:32]
+
+
+def _parse(line, line_number):
+    try:
+        record = json.loads(line)
+        table = TABLES_BY_NAME[record['type']]
+        # Fields missing from the record are left alone on update and get their defaults on insert
+        row = {field: _from_json(column, record[field]) for field, column in table.columns.items() if field in record}
+        if table.model is Project:
+            row['tags'] = record.get('tags') or []
+    except (ValueError, KeyError, TypeError) as e:
+        raise TransferError(f'line {line_number}: {e!r}') from e
+    missing = [key for key in table.keys if row.get(key) is None]
+    if missing:
+        raise TransferError(f"line {line_number}: {table.name} without {', '.join(missing)}")
+    return table, row
+
+
+def _flush(table, rows, file_hash, line_number, counts, started, log):
+    try:
+        if table.keys:
+            _upsert(table, rows)
+        else:
+            db.session.execute(db.insert(table.model), rows)
+        # Committed with the rows, so a resumed import neither skips nor repeats a batch
+        _write_progress(file_hash, line_number)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        raise TransferError(f'{table.name} batch ending at line {line_number}: {getattr(e, "orig", e)}') from e
+    db.session.expunge_all()
+    counts[table.name] = counts.get(table.name, 0) + len(rows)
+    if log:
+        total = sum(counts.values())
+        log(f'{table.name}: {counts[table.name]} row(s) imported, line {line_number} '
+            f'({total / max(time.monotonic() - started, 1e-6):.0f} rows/s)')
+
+
+def _upsert(table, rows):
+    """Inserts new rows and updates existing ones, with one SELECT per batch to tell them apart."""
+    model = table.model
+    # A key repeated within the batch keeps its last row
+    by_key = {tuple(row[key] for key in table.keys): row for row in rows}
+    tags = {key: row.pop('tags') for key, row in by_key.items()} if model is Project else None
+
+    existing = _existing_ids(table, by_key)
+    inserts = [row for key, row in by_key.items() if key not in existing]
+    updates = [dict(row, id=existing[key]) for key, row in by_key.items() if key in existing]
+    if inserts:
+        db.session.execute(db.insert(model), inserts)
+    if updates:
+        db.session.execute(db.update(model), updates)
+    if tags is not None:
+        ids = existing if not inserts else _existing_ids(table, by_key)
+        _replace_project_tags({ids[key]: names for key, names in tags.items()})
+
+
+def _existing_ids(table, by_key):
+    columns = [table.columns[key] for key in table.keys]
+    first_values = {key[0] for key in by_key}
+    rows = db.session.execute(db.select(table.model.id, *columns).where(columns[0].in_(first_values)))
+    # Several rows can share a non-unique key (project titles); the oldest one is updated
+    ids = {}
+    for row in rows:
+        ids.setdefault(tuple(row[1:]), row.id)
+    return {key: ids[key] for key in by_key if key in ids}
+
+
+def _replace_project_tags(tag_names):
+    """Sets the tags of a batch of projects; Tag.project_count is reconciled after the import."""
+    from tags import parse_tags
+
+    wanted = {project_id: parse_tags(', '.join(names)) for project_id, names in tag_names.items()}
+    slugs = {slug: name for pairs in wanted.values() for name, slug in pairs}
+    tag_ids = {}
+    if slugs:
+        tag_ids = dict(db.session.execute(db.select(Tag.slug, Tag.id).where(Tag.slug.in_(slugs))).all())
+        missing = [{'name': name, 'slug': slug, 'project_count': 0} for slug, name in slugs.items() if slug not in tag_ids]
+        if missing:
+            db.session.execute(db.insert(Tag), missing)
+            tag_ids = dict(db.session.execute(db.select(Tag.slug, Tag.id).where(Tag.slug.in_(slugs))).all())
+
+    db.session.execute(db.delete(project_tag).where(project_tag.c.project_id.in_(wanted)))
+    links = [{'project_id': project_id, 'tag_id': tag_ids[slug]}
+             for project_id, pairs in wanted.items() for _, slug in pairs]
+    if links:
+        db.session.execute(db.insert(project_tag), links)
+
+
+def _read_progress(file_hash):
+    progress = db.session.get(ImportProgress, file_hash)
+    return progress.line_number if progress else 0
+
+
+def _write_progress(file_hash, line_number):
+    progress = db.session.get(ImportProgress, file_hash)
+    if progress is None:
+        db.session.add(ImportProgress(file_hash=file_hash, line_number=line_number, updated_at=datetime.utcnow()))
+    else:
+        progress.line_number = line_number
+        progress.updated_at = datetime.utcnow()
+
+
+def _rebuild_derived(file_hash, log):
+    from blog import rebuild_rendered_posts
+    from cache import bump_content_version
+    from counters import reconcile_counters
+    from search import search_index
+    from tags import reconcile_tag_counts
+
+    if log:
+        log('Rebuilding tag counts, dashboard counters, rendered posts and the search index...')
+    reconcile_tag_counts()
+    reconcile_counters()
+    rebuild_rendered_posts()
+    search_index.rebuild()
+    bump_content_version()
+    db.session.query(ImportProgress).filter_by(file_hash=file_hash).delete()
+    db.session.commit()
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+PENDING_KEY = 'user_cache_invalidate'
+
+
+class CachedUser(UserMixin):
+    """Detached snapshot of a User row, safe to share between requests and threads."""
+
+    def __init__(self, id, username):
+        self.id = id
+        self.username = username
+
+    def __repr__(self):
+        return f'<CachedUser {self.username}>'
+
+
+class UserCache:
+    """
+    Bounded TTL cache for the Flask-Login user loader, so requests from a
+    logged-in admin do not each look up their User row.
+
+    Committed changes to a User drop its entry in this process and touch a
+    stamp file in the instance folder; other workers (and the server after
+    setup_admin.py ran) see the new mtime and clear their own cache on the
+    next lookup. On hosts that do not share the instance folder the TTL
+    bounds how long a stale identity can be used.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 60.0
+        self.max_entries = 64
+        self.stamp_path = None
+        self._stamp_seen = None
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL', 60.0)
+        self.max_entries = app.config.get('USER_CACHE_MAX_ENTRIES', 64)
+        self.stamp_path = app.config.get('USER_CACHE_STAMP') or os.path.join(app.instance_path, 'user_cache.stamp')
+        self._stamp_seen = self._read_stamp()
+        app.extensions['user_cache'] = self
+        _register_events()
+
+    def load(self, user_id):
+        """User loader: returns a CachedUser for the session's user id, or None."""
+        from extensions import db
+        from models import User
+
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+        if self.ttl <= 0:
+            user = db.session.get(User, user_id)
+            return CachedUser(user.id, user.username) if user else None
+
+        self._check_stamp()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._items.move_to_end(user_id)
+                self.counters['hits'] += 1
+                return entry[0]
+            self.counters['misses'] += 1
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            self.invalidate(user_id, broadcast=False)
+            return None
+        identity = CachedUser(user.id, user.username)
+        with self._lock:
+            self._items[user_id] = (identity, now + self.ttl)
+            self._items.move_to_end(user_id)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return identity
+
+    def invalidate(self, user_id=None, broadcast=True):
+        """
+        Drops the entry of `user_id` (every entry if None). With `broadcast`
+        the stamp file is touched so other processes clear their caches too.
+        """
+        with self._lock:
+            if user_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(user_id, None)
+            self.counters['invalidations'] += 1
+        if broadcast and self.stamp_path:
+            try:
+                os.makedirs(os.path.dirname(self.stamp_path), exist_ok=True)
+                with open(self.stamp_path, 'a'):
+                    os.utime(self.stamp_path)
+                # This process is already up to date
+                self._stamp_seen = self._read_stamp()
+            except OSError:
+                pass
+
+    def stats(self):
+        """Returns a snapshot of the cache counters."""
+        with self._lock:
+            return dict(self.counters, entries=len(self._items))
+
+    # --- Internal helpers ---
+
+    def _read_stamp(self):
+        try:
+            return os.stat(self.stamp_path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def _check_stamp(self):
+        # One stat() per lookup, far cheaper than the query it replaces
+        stamp = self._read_stamp()
+        if stamp != self._stamp_seen:
+            with self._lock:
+                self._items.clear()
+                self.counters['invalidations'] += 1
+            self._stamp_seen = stamp
+
+
+user_cache = UserCache()
+
+
+# --- Invalidation on commit ---
+
+_events_registered = False
+
+
+def _register_events():
+    global _events_registered
+    if _events_registered:
+        return
+    from models import User
+
+    def remember(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault(PENDING_KEY, set()).add(target.id)
+
+    # Inserts matter too: a deleted id can be reused by a new row
+    for name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(User, name, remember)
+
+    @event.listens_for(Session, 'after_commit')
+    def invalidate_committed(session):
+        for user_id in session.info.pop(PENDING_KEY, ()):
+            user_cache.invalidate(user_id)
+
+    @event.listens_for(Session, 'after_rollback')
+    def forget_rolled_back(session):
+        session.info.pop(PENDING_KEY, None)
+
+    _events_registered = True
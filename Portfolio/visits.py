@@ -0,0 +1,163 @@
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+
+from runtime import ProcessLocal, start_thread
+
+
+class VisitRecorder:
+    """
+    Write-behind recorder for page visits.
+
+    Visits are put on a bounded in-process queue and a background thread
+    bulk-inserts them once VISIT_FLUSH_BATCH rows are waiting or every
+    VISIT_FLUSH_INTERVAL seconds, whichever comes first. Setting
+    VISIT_TRACKING_MODE to 'sync' keeps the old commit-per-request behaviour.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.mode = 'buffered'
+        self.batch_size = 500
+        self.flush_interval = 5.0
+        self.rollup_interval = 0
+        self._last_rollup = time.monotonic()
+        self._queue = queue.Queue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._worker = ProcessLocal(self._start_worker, on_fork=self._drop_inherited)
+        self.counters = {'recorded': 0, 'flushed': 0, 'dropped': 0, 'failed': 0, 'batches': 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.mode = app.config.get('VISIT_TRACKING_MODE', 'buffered')
+        self.batch_size = app.config.get('VISIT_FLUSH_BATCH', 500)
+        self.flush_interval = app.config.get('VISIT_FLUSH_INTERVAL', 5.0)
+        self.rollup_interval = app.config.get('VISIT_ROLLUP_INTERVAL', 300)
+        self._queue = queue.Queue(maxsize=app.config.get('VISIT_BUFFER_SIZE', 10000))
+        app.extensions['visit_recorder'] = self
+        atexit.register(self.stop)
+
+    def record(self, ip_address, user_agent):
+        """Records a single visit, either immediately or via the buffer."""
+        if self.mode == 'sync':
+            from extensions import db
+            from models import Visit
+            db.session.add(Visit(**self._row(ip_address, user_agent)))
+            db.session.commit()
+            return
+
+        self._worker.get()
+        try:
+            self._queue.put_nowait(self._row(ip_address, user_agent))
+        except queue.Full:
+            self._bump('dropped')
+            return
+        self._bump('recorded')
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Drains the buffer into the database in batches. Returns rows written."""
+        written = 0
+        while True:
+            rows = []
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not rows:
+                return written
+            if self._insert(rows):
+                written += len(rows)
+
+    def stop(self):
+        """Stops the background flusher and writes out anything still buffered."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._worker.reset()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout=self.flush_interval + 5)
+        if self.app is not None and thread is not None:
+            self.flush()
+
+    def stats(self):
+        """Returns a snapshot of the recorder counters and current backlog."""
+        with self._lock:
+            stats = dict(self.counters)
+        stats['pending'] = self._queue.qsize()
+        stats['mode'] = self.mode
+        return stats
+
+    # --- Internal helpers ---
+
+    @staticmethod
+    def _row(ip_address, user_agent):
+        # The timestamp is taken now rather than at insert time
+        return {
+            'ip_address': ip_address,
+            'user_agent': user_agent[:255] if user_agent else user_agent,
+            'timestamp': datetime.utcnow(),
+        }
+
+    def _bump(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def _start_worker(self):
+        self._stop.clear()
+        return start_thread(self._run, 'visit-recorder')
+
+    def _drop_inherited(self):
+        # Anything inherited from the parent process belongs to the parent
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+            self._maybe_rollup()
+
+    def _maybe_rollup(self):
+        # Keeps the analytics rollups current and prunes old raw rows
+        if not self.rollup_interval or time.monotonic() - self._last_rollup < self.rollup_interval:
+            return
+        self._last_rollup = time.monotonic()
+        from analytics import rollup_visits, prune_visits
+        from extensions import db
+
+        with self.app.app_context():
+            try:
+                rollup_visits()
+                prune_visits()
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.error(f"Error rolling up visits: {e}")
+
+    def _insert(self, rows):
+        from sqlalchemy import insert
+        from extensions import db
+        from models import Visit
+
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(Visit), rows)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                self._bump('failed', len(rows))
+                self.app.logger.error(f"Error writing {len(rows)} visit(s): {e}")
+                return False
+        self._bump('flushed', len(rows))
+        self._bump('batches')
+        return True
+
+
+visit_recorder = VisitRecorder()